@@ -1,7 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth import get_user_model
-from .models import User
 
 User = get_user_model()
 
@@ -34,4 +33,4 @@ class UserAdmin(BaseUserAdmin):
     
     def get_queryset(self, request):
         """Show all users including soft-deleted in admin."""
-        return User.objects.unfiltered()
+        return User.objects.unfiltered().select_related('brand')
@@ -0,0 +1,49 @@
+"""Authentication classes for the accounts app."""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Columns read from request.user by permissions, views and UserSerializer
+REQUEST_USER_FIELDS = (
+    'id', 'email', 'first_name', 'last_name', 'role', 'brand',
+    'is_active', 'is_staff', 'is_superuser', 'is_deleted',
+    'created_at', 'updated_at',
+)
+
+
+class ProjectedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that loads only the user columns requests need."""
+
+    def get_user(self, validated_token):
+        """Find the token's user without pulling the password hash and login metadata."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        fields = REQUEST_USER_FIELDS
+        if api_settings.CHECK_REVOKE_TOKEN:
+            fields += ('password',)
+
+        try:
+            user = self.user_model.objects.only(*fields).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
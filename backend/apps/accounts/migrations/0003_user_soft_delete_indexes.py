@@ -0,0 +1,27 @@
+# Generated by Django 5.0.8 on 2026-10-15 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_alter_user_options_user_brand"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("brands", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["is_deleted", "email"], name="user_active_email_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["is_deleted", "role"], name="user_active_role_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["is_deleted", "brand"], name="user_brand_idx"),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+
+
+def lowercase_emails(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    users = User.objects.using(schema_editor.connection.alias)
+
+    # Two addresses that normalize alike would break the unique email index mid-update
+    collisions = list(
+        users.values(normalized=Lower(Trim("email")))
+        .annotate(n=Count("pk"))
+        .filter(n__gt=1)
+        .values_list("normalized", flat=True)
+    )
+    if collisions:
+        raise RuntimeError(
+            "Cannot lowercase user emails; these addresses belong to more than one user "
+            "once case and surrounding whitespace are ignored. Merge or rename those "
+            f"accounts first: {', '.join(sorted(collisions))}"
+        )
+
+    users.update(email=Lower(Trim("email")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_user_soft_delete_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 import uuid
+from functools import cached_property
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.contrib.auth.base_user import BaseUserManager
 from django.db import models
@@ -10,14 +11,28 @@ from .roles import ROLE_CHOICES, SYSTEM_ADMIN
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication."""
 
-    def create_user(self, email, password=None, **extra_fields):
-        """Create and return a regular user."""
+    @classmethod
+    def normalize_email(cls, email):
+        """Strip and lowercase the whole address so lookups are exact matches."""
+        return super().normalize_email(email).strip().lower()
+
+    def get_by_natural_key(self, username):
+        """Look up users by their normalized email."""
+        return self.get(**{self.model.USERNAME_FIELD: self.normalize_email(username)})
+
+    def build_user(self, email, password=None, **extra_fields):
+        """Return an unsaved user with a normalized email and a hashed password."""
         if not email:
             raise ValueError("The Email field must be set")
 
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
+        return user
+
+    def create_user(self, email, password=None, **extra_fields):
+        """Create and return a regular user."""
+        user = self.build_user(email, password, **extra_fields)
         user.save(using=self._db)
         return user
 
@@ -66,13 +81,29 @@ class User(AbstractBaseUser, PermissionsMixin, TimestampMixin, SoftDeleteMixin):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["is_deleted", "email"], name="user_active_email_idx"),
+            models.Index(fields=["is_deleted", "role"], name="user_active_role_idx"),
+            models.Index(fields=["is_deleted", "brand"], name="user_brand_idx"),
+        ]
 
     def __str__(self):
         return self.email
 
-    @property
+    def save(self, *args, **kwargs):
+        """Normalize the email and drop the cached full name before saving."""
+        # Skip a deferred email, or one not being written, instead of loading it
+        update_fields = kwargs.get("update_fields")
+        if "email" not in self.get_deferred_fields() and (
+            update_fields is None or "email" in update_fields
+        ):
+            self.email = self.__class__.objects.normalize_email(self.email)
+        self.__dict__.pop("full_name", None)
+        super().save(*args, **kwargs)
+
+    @cached_property
     def full_name(self):
-        """Return the full name of the user."""
+        """Return the full name of the user (cached until the next save)."""
         return f"{self.first_name} {self.last_name}".strip() or self.email
 
     def has_role(self, *roles):
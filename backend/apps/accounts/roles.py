@@ -13,11 +13,15 @@ ROLE_CHOICES = [
     (STAFF, "Staff"),
 ]
 
+MANAGER_ROLES = frozenset({SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER})
+# Roles that may create and delete brand-scoped records
+WRITE_ROLES = frozenset({SYSTEM_ADMIN, BRAND_MANAGER})
+ROLE_DISPLAY = dict(ROLE_CHOICES)
+
 # Helper functions
 def get_role_display(role):
     """Get display name for a role."""
-    role_dict = dict(ROLE_CHOICES)
-    return role_dict.get(role, role)
+    return ROLE_DISPLAY.get(role, role)
 
 
 def is_admin_role(role):
@@ -27,4 +31,4 @@ def is_admin_role(role):
 
 def is_manager_role(role):
     """Check if role is manager level."""
-    return role in [SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER]
\ No newline at end of file
+    return role in MANAGER_ROLES
\ No newline at end of file
@@ -1,41 +1,66 @@
 """Serializers for user authentication and management."""
 
-from rest_framework import serializers
+from operator import attrgetter
+from django.db import IntegrityError, models, transaction
+from rest_framework import exceptions, serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
+from apps.common.serializers import unique_conflict_error
 from .roles import ROLE_CHOICES
 
 User = get_user_model()
 
+# Columns needed to verify credentials and render UserSerializer on login
+LOGIN_USER_FIELDS = (
+    'id', 'email', 'password', 'first_name', 'last_name', 'role',
+    'is_active', 'is_staff', 'is_deleted', 'created_at', 'updated_at',
+)
+
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom token serializer that blocks deleted users."""
     
     def validate(self, attrs):
-        # Check if user exists and is not soft-deleted before authentication
-        email = attrs.get('email') or attrs.get(self.username_field)
+        # Load the account once (including soft-deleted users) and check the
+        # password against that row instead of letting authenticate() fetch it again
+        email = User.objects.normalize_email(attrs[self.username_field])
+        password = attrs['password']
+        
+        try:
+            user = User.objects.unfiltered().only(*LOGIN_USER_FIELDS).get(email=email)
+        except User.DoesNotExist:
+            # Run the hasher anyway so unknown emails take as long as wrong passwords
+            User().set_password(password)
+            user = None
+        else:
+            if user.is_deleted:
+                raise serializers.ValidationError({
+                    "detail": "Account is deleted", 
+                    "code": "ACCOUNT_DELETED"
+                })
+            if not user.check_password(password):
+                user = None
         
-        if email:
-            try:
-                # Use unfiltered to get even soft-deleted users
-                user = User.objects.unfiltered().get(email=email)
-                if user.is_deleted:
-                    raise serializers.ValidationError({
-                        "detail": "Account is deleted", 
-                        "code": "ACCOUNT_DELETED"
-                    })
-            except User.DoesNotExist:
-                pass  # Let the parent validation handle this
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
         
-        # Use parent validation which handles authentication
-        data = super().validate(attrs)
+        self.user = user
         
         # Add custom claims
         refresh = self.get_token(self.user)
-        data['refresh'] = str(refresh)
-        data['access'] = str(refresh.access_token)
-        data['user'] = UserSerializer(self.user).data
+        data = {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': UserSerializer(self.user).data,
+        }
+        
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
         
         return data
 
@@ -54,12 +79,22 @@ class UserSerializer(serializers.ModelSerializer):
             'password'
         ]
         extra_kwargs = {
+            # Uniqueness is checked against the normalized email in validate_email
+            'email': {'validators': []},
             'password': {'write_only': True},
             'id': {'read_only': True},
             'created_at': {'read_only': True},
             'updated_at': {'read_only': True},
         }
     
+    def validate_email(self, value):
+        """Normalize the email and make sure no other user has it."""
+        email = User.objects.normalize_email(value)
+        instance_pk = self.instance.pk if self.instance else None
+        if User.objects.unfiltered().filter(email=email).exclude(pk=instance_pk).exists():
+            raise serializers.ValidationError('User with this email already exists.')
+        return email
+    
     def create(self, validated_data):
         """Create a new user with encrypted password."""
         password = validated_data.pop('password', None)
@@ -93,12 +128,80 @@ class UserCreateSerializer(UserSerializer):
         fields = UserSerializer.Meta.fields
         extra_kwargs = {
             **UserSerializer.Meta.extra_kwargs,
-            'email': {'required': True},
+            'email': {'required': True, 'validators': []},
             'first_name': {'required': True},
             'last_name': {'required': True},
         }
 
 
+class UserBulkItemSerializer(UserCreateSerializer):
+    """Bulk create item whose email is checked against stored users once per batch."""
+    
+    def validate_email(self, value):
+        """Normalize the email; UserBulkCreateSerializer checks it for duplicates."""
+        return User.objects.normalize_email(value)
+
+
+class UserBulkCreateSerializer(serializers.ListSerializer):
+    """Serializer for creating many users with a single bulk insert."""
+    
+    child = UserBulkItemSerializer()
+    
+    def to_internal_value(self, data):
+        """Look up which of the payload's emails are already taken with one query."""
+        items = data if isinstance(data, list) else []
+        emails = {
+            User.objects.normalize_email(item['email'])
+            for item in items
+            if isinstance(item, dict) and isinstance(item.get('email'), str)
+        }
+        self._claimed_emails = set(
+            User.objects.unfiltered().filter(email__in=emails).values_list('email', flat=True)
+        )
+        return super().to_internal_value(data)
+    
+    def run_child_validation(self, data):
+        """Validate one item, rejecting an email that is stored or claimed earlier in the batch."""
+        validated = super().run_child_validation(data)
+        if validated['email'] in self._claimed_emails:
+            raise serializers.ValidationError({'email': ['User with this email already exists.']})
+        self._claimed_emails.add(validated['email'])
+        return validated
+    
+    def create(self, validated_data):
+        """Build users through the manager and insert them in batches."""
+        users = [User.objects.build_user(**item) for item in validated_data]
+        try:
+            with transaction.atomic():
+                return User.objects.bulk_create(users, batch_size=500)
+        except IntegrityError as exc:
+            # Another request took one of the emails since validation
+            error = unique_conflict_error(exc, User, {'email': 'email'})
+            if error is None:
+                raise
+            raise error from exc
+
+
+class UserListListSerializer(serializers.ListSerializer):
+    """List serializer that resolves the child's readable fields once per page."""
+    
+    def to_representation(self, data):
+        """Serialize each user with plain attribute lookups."""
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        fields = [
+            (field.field_name, attrgetter(field.source), field.to_representation)
+            for field in self.child._readable_fields
+        ]
+        
+        return [
+            {
+                name: None if (value := getter(instance)) is None else to_representation(value)
+                for name, getter, to_representation in fields
+            }
+            for instance in iterable
+        ]
+
+
 class UserListSerializer(serializers.ModelSerializer):
     """Simplified serializer for user listing."""
     
@@ -109,4 +212,6 @@ class UserListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'email', 'first_name', 'last_name', 'full_name',
             'role', 'is_active', 'created_at'
-        ]
\ No newline at end of file
+        ]
+        read_only_fields = fields
+        list_serializer_class = UserListListSerializer
\ No newline at end of file
@@ -2,11 +2,14 @@
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase, APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.accounts.roles import SYSTEM_ADMIN, STAFF
+from apps.accounts.serializers import UserBulkCreateSerializer
 
 User = get_user_model()
 
@@ -22,16 +25,18 @@ class AuthenticationTestCase(APITestCase):
         self.logout_url = reverse('accounts:logout')
         self.me_url = reverse('accounts:user_me')
         self.users_url = reverse('accounts:user_list')
-        
-        # Create test users
-        self.admin_user = User.objects.create_superuser(
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Create test users once for the whole test case."""
+        cls.admin_user = User.objects.create_superuser(
             email='admin@test.com',
             password='AdminPass123!',
             first_name='Admin',
             last_name='User'
         )
         
-        self.staff_user = User.objects.create_user(
+        cls.staff_user = User.objects.create_user(
             email='staff@test.com',
             password='StaffPass123!',
             first_name='Staff',
@@ -40,14 +45,14 @@ class AuthenticationTestCase(APITestCase):
         )
         
         # Create soft-deleted user
-        self.deleted_user = User.objects.create_user(
+        cls.deleted_user = User.objects.create_user(
             email='deleted@test.com',
             password='DeletedPass123!',
             first_name='Deleted',
             last_name='User',
             role=STAFF
         )
-        self.deleted_user.soft_delete()
+        cls.deleted_user.soft_delete()
     
     def test_successful_login(self):
         """Test successful login returns tokens and user data."""
@@ -73,7 +78,30 @@ class AuthenticationTestCase(APITestCase):
         response = self.client.post(self.login_url, data)
         
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-    
+
+    def test_login_with_unknown_email(self):
+        """Test login with an unknown email fails."""
+        data = {
+            'email': 'nobody@test.com',
+            'password': 'AdminPass123!'
+        }
+        response = self.client.post(self.login_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_login_blocked(self):
+        """Test that inactive users cannot login."""
+        self.staff_user.is_active = False
+        self.staff_user.save()
+
+        data = {
+            'email': 'staff@test.com',
+            'password': 'StaffPass123!'
+        }
+        response = self.client.post(self.login_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
     def test_deleted_user_login_blocked(self):
         """Test that soft-deleted users cannot login."""
         data = {
@@ -141,16 +169,18 @@ class UserManagementTestCase(APITestCase):
         self.client = APIClient()
         self.me_url = reverse('accounts:user_me')
         self.users_url = reverse('accounts:user_list')
-        
-        # Create test users
-        self.admin_user = User.objects.create_superuser(
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Create test users once for the whole test case."""
+        cls.admin_user = User.objects.create_superuser(
             email='admin@test.com',
             password='AdminPass123!',
             first_name='Admin',
             last_name='User'
         )
         
-        self.staff_user = User.objects.create_user(
+        cls.staff_user = User.objects.create_user(
             email='staff@test.com',
             password='StaffPass123!',
             first_name='Staff',
@@ -167,7 +197,32 @@ class UserManagementTestCase(APITestCase):
         self.assertEqual(response.data['email'], 'admin@test.com')
         self.assertEqual(response.data['role'], SYSTEM_ADMIN)
         self.assertEqual(response.data['full_name'], 'Admin User')
-    
+
+    def test_user_me_endpoint_with_token_single_query(self):
+        """Test token-authenticated profile reads load the user once."""
+        token = RefreshToken.for_user(self.staff_user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.me_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'staff@test.com')
+
+    def test_user_me_endpoint_etag(self):
+        """Test profile endpoint returns 304 until the profile changes."""
+        self.client.force_authenticate(user=self.admin_user)
+        etag = self.client.get(self.me_url)['ETag']
+
+        response = self.client.get(self.me_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(self.me_url, {'first_name': 'Changed'})
+        response = self.client.get(self.me_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'Changed')
+        self.assertNotEqual(response['ETag'], etag)
+
     def test_user_me_endpoint_unauthenticated(self):
         """Test unauthenticated user cannot access profile endpoint."""
         response = self.client.get(self.me_url)
@@ -181,7 +236,18 @@ class UserManagementTestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['count'], 2)  # admin and staff user
-    
+
+    def test_user_list_representation(self):
+        """Test user list rows match the single-user serializer output."""
+        from apps.accounts.serializers import UserListSerializer
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.users_url)
+
+        row = next(r for r in response.data['results'] if r['email'] == 'staff@test.com')
+        self.assertEqual(row, UserListSerializer(self.staff_user).data)
+        self.assertEqual(row['full_name'], 'Staff Member')
+
     def test_staff_cannot_list_users(self):
         """Test staff user cannot list users."""
         self.client.force_authenticate(user=self.staff_user)
@@ -192,11 +258,90 @@ class UserManagementTestCase(APITestCase):
     def test_unauthenticated_cannot_list_users(self):
         """Test unauthenticated user cannot list users."""
         response = self.client.get(self.users_url)
-        
+
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_admin_can_bulk_create_users(self):
+        """Test system admin can create several users in one request."""
+        self.client.force_authenticate(user=self.admin_user)
+        data = [
+            {
+                'email': f'bulk{i}@test.com',
+                'password': 'BulkPass123!',
+                'first_name': 'Bulk',
+                'last_name': f'User{i}',
+                'role': STAFF,
+            }
+            for i in range(3)
+        ]
+        response = self.client.post(reverse('accounts:user_bulk_create'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertNotIn('password', response.data[0])
+        user = User.objects.get(email='bulk1@test.com')
+        self.assertTrue(user.check_password('BulkPass123!'))
+
+    def test_bulk_create_rejects_duplicate_emails(self):
+        """Test bulk creation fails when the batch repeats an email."""
+        self.client.force_authenticate(user=self.admin_user)
+        item = {
+            'email': 'dup@test.com',
+            'password': 'BulkPass123!',
+            'first_name': 'Dup',
+            'last_name': 'User',
+            'role': STAFF,
+        }
+        response = self.client.post(reverse('accounts:user_bulk_create'), [item, item], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(email='dup@test.com').exists())
+
+    def test_bulk_create_rejects_existing_emails_per_item(self):
+        """Test that emails already stored are reported on their items without inserting any."""
+        self.client.force_authenticate(user=self.admin_user)
+        data = [
+            {
+                'email': email,
+                'password': 'BulkPass123!',
+                'first_name': 'Bulk',
+                'last_name': 'User',
+                'role': STAFF,
+            }
+            for email in ('fresh@test.com', self.staff_user.email.upper())
+        ]
+        response = self.client.post(reverse('accounts:user_bulk_create'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('email', response.data[1])
+        self.assertFalse(User.objects.filter(email='fresh@test.com').exists())
 
-class PasswordValidationTestCase(APITestCase):
+    def test_bulk_create_maps_racing_duplicate_email(self):
+        """Test that an email taken between validation and insert becomes a 400, not a 500."""
+        serializer = UserBulkCreateSerializer(data=[{
+            'email': 'race@test.com',
+            'password': 'BulkPass123!',
+            'first_name': 'Race',
+            'last_name': 'User',
+            'role': STAFF,
+        }])
+        self.assertTrue(serializer.is_valid())
+        User.objects.create_user(email='race@test.com', password='TestPass123!')
+
+        with self.assertRaises(ValidationError) as raised:
+            serializer.save()
+        self.assertIn('email', raised.exception.detail)
+
+    def test_staff_cannot_bulk_create_users(self):
+        """Test staff user cannot bulk create users."""
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.post(reverse('accounts:user_bulk_create'), [], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PasswordValidationTestCase(SimpleTestCase):
     """Test cases for custom password validation."""
     
     def test_weak_password_rejected(self):
@@ -238,17 +383,6 @@ class PasswordValidationTestCase(APITestCase):
             validator.validate('StrongPass123!')
         except Exception as e:
             self.fail(f"Strong password was rejected: {e}")
-        
-        # Also test with user creation
-        user = User.objects.create_user(
-            email='test@test.com',
-            password='StrongPass123!',
-            first_name='Test',
-            last_name='User'
-        )
-        
-        self.assertEqual(user.email, 'test@test.com')
-        self.assertTrue(user.check_password('StrongPass123!'))
 
 
 class UserModelTestCase(APITestCase):
@@ -267,6 +401,18 @@ class UserModelTestCase(APITestCase):
         self.assertEqual(len(str(user.id)), 36)  # UUID string length
         self.assertIn('-', str(user.id))  # UUID has hyphens
     
+    def test_create_user_with_strong_password(self):
+        """Test that a user created with a strong password can authenticate with it."""
+        user = User.objects.create_user(
+            email='test@test.com',
+            password='StrongPass123!',
+            first_name='Test',
+            last_name='User'
+        )
+        
+        self.assertEqual(user.email, 'test@test.com')
+        self.assertTrue(user.check_password('StrongPass123!'))
+    
     def test_soft_delete_functionality(self):
         """Test soft delete methods work correctly."""
         user = User.objects.create_user(
@@ -322,3 +468,49 @@ class UserModelTestCase(APITestCase):
         self.assertTrue(staff_user.has_role(STAFF))
         self.assertFalse(staff_user.has_role(SYSTEM_ADMIN))
         self.assertFalse(staff_user.is_system_admin())
+
+    def test_full_name_refreshed_on_save(self):
+        """Test cached full name is recomputed after the user is saved."""
+        user = User.objects.create_user(
+            email='test@test.com',
+            password='TestPass123!',
+            first_name='Test',
+            last_name='User'
+        )
+        self.assertEqual(user.full_name, 'Test User')
+
+        user.first_name = 'Renamed'
+        user.save()
+
+        self.assertEqual(user.full_name, 'Renamed User')
+
+    def test_email_normalized_to_lowercase(self):
+        """Test emails are stored lowercase and login ignores case."""
+        user = User.objects.create_user(
+            email=' Mixed.Case@Test.com ',
+            password='TestPass123!',
+            first_name='Mixed',
+            last_name='Case'
+        )
+        self.assertEqual(user.email, 'mixed.case@test.com')
+
+        response = self.client.post(
+            reverse('accounts:token_obtain_pair'),
+            {'email': 'MIXED.case@test.COM', 'password': 'TestPass123!'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_save_does_not_load_deferred_email(self):
+        """Test that saving a projected user skips email normalization instead of fetching it."""
+        user = User.objects.create_user(
+            email='deferred@test.com',
+            password='TestPass123!',
+            first_name='Deferred',
+            last_name='User'
+        )
+        user = User.objects.only('id', 'first_name').get(pk=user.pk)
+        user.first_name = 'Renamed'
+
+        with self.assertNumQueries(1):
+            user.save(update_fields=['first_name'])
+
@@ -8,6 +8,7 @@ from .views import (
     UserMeView,
     UserListView,
     UserCreateView,
+    UserBulkCreateView,
 )
 
 app_name = 'accounts'
@@ -22,4 +23,5 @@ urlpatterns = [
     path('users/me/', UserMeView.as_view(), name='user_me'),
     path('users/', UserListView.as_view(), name='user_list'),
     path('users/create/', UserCreateView.as_view(), name='user_create'),
+    path('users/bulk/', UserBulkCreateView.as_view(), name='user_bulk_create'),
 ]
\ No newline at end of file
@@ -4,6 +4,11 @@ import re
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext as _
 
+UPPERCASE_RE = re.compile(r"[A-Z]")
+LOWERCASE_RE = re.compile(r"[a-z]")
+DIGIT_RE = re.compile(r"\d")
+SYMBOL_RE = re.compile(r"[!@#$%^&*(),.?\":{}|<>]")
+
 
 class ComplexPasswordValidator:
     """
@@ -22,25 +27,25 @@ class ComplexPasswordValidator:
                 code="password_too_short",
             )
 
-        if not re.search(r"[A-Z]", password):
+        if not UPPERCASE_RE.search(password):
             raise ValidationError(
                 _("Password must contain at least one uppercase letter."),
                 code="password_no_upper",
             )
 
-        if not re.search(r"[a-z]", password):
+        if not LOWERCASE_RE.search(password):
             raise ValidationError(
                 _("Password must contain at least one lowercase letter."),
                 code="password_no_lower",
             )
 
-        if not re.search(r"\d", password):
+        if not DIGIT_RE.search(password):
             raise ValidationError(
                 _("Password must contain at least one digit."),
                 code="password_no_digit",
             )
 
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        if not SYMBOL_RE.search(password):
             raise ValidationError(
                 _("Password must contain at least one special character."),
                 code="password_no_symbol",
@@ -9,13 +9,15 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from django.contrib.auth import get_user_model
+from django.utils.cache import get_conditional_response, quote_etag
 from apps.common.permissions import RequireRolesMixin
 from apps.accounts.roles import SYSTEM_ADMIN
 from .serializers import (
     CustomTokenObtainPairSerializer,
     UserSerializer,
     UserListSerializer,
-    UserCreateSerializer
+    UserCreateSerializer,
+    UserBulkCreateSerializer
 )
 
 User = get_user_model()
@@ -25,11 +27,8 @@ class SystemAdminPermission(permissions.BasePermission):
     """Permission class that only allows system admins."""
     
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated and 
-            hasattr(request.user, 'role') and 
-            request.user.role == SYSTEM_ADMIN
-        )
+        user = request.user
+        return user.is_authenticated and getattr(user, 'role', None) == SYSTEM_ADMIN
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -76,6 +75,16 @@ class UserMeView(RetrieveUpdateAPIView):
     
     def get_object(self):
         return self.request.user
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Return 304 when the client already holds the current profile."""
+        user = self.get_object()
+        etag = 'W/' + quote_etag(f'{user.pk}-{user.updated_at.timestamp()}')
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(self.get_serializer(user).data)
+        response.headers['ETag'] = etag
+        return response
 
 
 class UserListView(ListAPIView):
@@ -86,7 +95,10 @@ class UserListView(ListAPIView):
     
     def get_queryset(self):
         """Return all users including soft-deleted ones for admins."""
-        return User.objects.unfiltered().all()
+        return User.objects.unfiltered().select_related('brand').only(
+            'id', 'email', 'first_name', 'last_name', 'role', 'is_active',
+            'created_at', 'brand__id', 'brand__name'
+        )
 
 
 class UserCreateView(APIView):
@@ -102,3 +114,18 @@ class UserCreateView(APIView):
                 status=status.HTTP_201_CREATED
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class UserBulkCreateView(APIView):
+    """View for system admins to create many users in one request."""
+    permission_classes = [SystemAdminPermission]
+    
+    def post(self, request):
+        serializer = UserBulkCreateSerializer(data=request.data)
+        if serializer.is_valid():
+            users = serializer.save()
+            return Response(
+                UserSerializer(users, many=True).data, 
+                status=status.HTTP_201_CREATED
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
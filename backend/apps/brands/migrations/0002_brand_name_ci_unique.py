@@ -0,0 +1,20 @@
+# Generated by Django 5.0.8 on 2026-10-15 09:32
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="brand",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("name"), name="brand_name_ci_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.8 on 2026-10-15 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0002_brand_name_ci_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="brand",
+            index=models.Index(
+                fields=["is_active", "-created_at"], name="brand_active_created_idx"
+            ),
+        ),
+    ]
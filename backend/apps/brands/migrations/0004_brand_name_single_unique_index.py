@@ -0,0 +1,31 @@
+# Generated by Django 5.0.8 on 2026-10-15 10:11
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0003_brand_active_created_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="brand",
+            name="brand_name_ci_unique",
+        ),
+        migrations.AlterField(
+            model_name="brand",
+            name="name",
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name="brand",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("name"),
+                name="brand_name_ci_unique",
+                violation_error_message="Brand name must be unique (case-insensitive).",
+            ),
+        ),
+    ]
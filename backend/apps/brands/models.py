@@ -1,12 +1,14 @@
 """Brand models for the inventory platform."""
 from django.db import models
+from django.db.models.functions import Lower
 from apps.common.models import BaseModel
 
 
 class Brand(BaseModel):
     """Brand model representing a business entity."""
     
-    name = models.CharField(max_length=255, unique=True, db_index=True)
+    # Uniqueness comes from brand_name_ci_unique, which also rejects exact duplicates
+    name = models.CharField(max_length=255, db_index=True)
     is_active = models.BooleanField(default=True)
     
     class Meta:
@@ -14,21 +16,18 @@ class Brand(BaseModel):
         verbose_name = 'Brand'
         verbose_name_plural = 'Brands'
         ordering = ['-created_at']
+        indexes = [
+            # Backs the ?is_active= list filter in the default ordering
+            models.Index(fields=['is_active', '-created_at'], name='brand_active_created_idx'),
+        ]
+        constraints = [
+            # Case-insensitive uniqueness enforced by a unique expression index
+            models.UniqueConstraint(
+                Lower('name'),
+                name='brand_name_ci_unique',
+                violation_error_message='Brand name must be unique (case-insensitive).',
+            ),
+        ]
     
     def __str__(self):
         return self.name
-    
-    def save(self, *args, **kwargs):
-        """Override save to ensure case-insensitive uniqueness."""
-        # Convert name to lowercase for case-insensitive comparison
-        if self.name:
-            # Check for case-insensitive duplicates
-            existing = Brand.objects.filter(
-                name__iexact=self.name
-            ).exclude(pk=self.pk).exists()
-            
-            if existing:
-                from django.core.exceptions import ValidationError
-                raise ValidationError({'name': 'Brand name must be unique (case-insensitive).'})
-        
-        super().save(*args, **kwargs)
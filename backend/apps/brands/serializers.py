@@ -1,25 +1,25 @@
 """Brand serializers for the inventory platform."""
 from rest_framework import serializers
+from apps.common.serializers import UniqueConflictMixin
 from .models import Brand
 
 
-class BrandSerializer(serializers.ModelSerializer):
+class BrandSerializer(UniqueConflictMixin, serializers.ModelSerializer):
     """Serializer for Brand model."""
     
+    # Uniqueness is enforced by the brand_name_ci_unique index on save
+    conflict_fields = {'brand_name_ci_unique': 'name'}
+    
     class Meta:
         model = Brand
         fields = ['id', 'name', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class BrandReadSerializer(serializers.ModelSerializer):
+    """Read-only serializer for Brand list and detail responses."""
     
-    def validate_name(self, value):
-        """Validate brand name for uniqueness (case-insensitive)."""
-        if value:
-            # Check for case-insensitive duplicates
-            instance_pk = self.instance.pk if self.instance else None
-            existing = Brand.objects.filter(
-                name__iexact=value
-            ).exclude(pk=instance_pk).exists()
-            
-            if existing:
-                raise serializers.ValidationError('Brand name must be unique (case-insensitive).')
-        return value
\ No newline at end of file
+    class Meta:
+        model = Brand
+        fields = BrandSerializer.Meta.fields
+        read_only_fields = fields
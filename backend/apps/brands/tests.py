@@ -1,13 +1,17 @@
 """Tests for Brand models and API endpoints."""
 import json
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken
 from apps.accounts.roles import SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER, STAFF
+from apps.common.permissions import BrandScopedPermission, request_brand_id, request_is_system_admin
+from apps.common.testing import BrandRoleTestData
 from .models import Brand
+from .views import BrandViewSet
 
 User = get_user_model()
 
@@ -43,132 +47,93 @@ class BrandModelTest(TestCase):
         self.assertTrue(brand.is_active)
 
 
-class BrandAPITest(APITestCase):
+class BrandAPITest(BrandRoleTestData, APITestCase):
     """Test Brand API endpoints."""
     
-    def setUp(self):
-        """Set up test data."""
-        # Create brands
-        self.brand1 = Brand.objects.create(name="Brand One")
-        self.brand2 = Brand.objects.create(name="Brand Two")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        super().setUpTestData()
         
-        # Create users with different roles
-        self.system_admin = User.objects.create_user(
-            email="admin@test.com",
-            password="TestPassword123!",
-            role=SYSTEM_ADMIN,
-            first_name="System",
-            last_name="Admin"
-        )
-        
-        self.brand_manager = User.objects.create_user(
-            email="manager@test.com",
-            password="TestPassword123!",
-            role=BRAND_MANAGER,
-            brand=self.brand1,
-            first_name="Brand",
-            last_name="Manager"
-        )
-        
-        self.store_manager = User.objects.create_user(
-            email="store@test.com",
-            password="TestPassword123!",
-            role=STORE_MANAGER,
-            brand=self.brand1,
-            first_name="Store",
-            last_name="Manager"
-        )
+        # Issue access tokens directly; no refresh token is recorded for blacklisting
+        cls._tokens = {
+            user.pk: str(AccessToken.for_user(user))
+            for user in (cls.system_admin, cls.brand_manager, cls.store_manager, cls.staff)
+        }
         
-        self.staff = User.objects.create_user(
-            email="staff@test.com",
-            password="TestPassword123!",
-            role=STAFF,
-            brand=self.brand1,
-            first_name="Staff",
-            last_name="User"
-        )
+        # Build one authenticated client per role
+        cls.admin_client = cls._authenticated_client(cls.system_admin)
+        cls.brand_manager_client = cls._authenticated_client(cls.brand_manager)
+        cls.store_manager_client = cls._authenticated_client(cls.store_manager)
+        cls.staff_client = cls._authenticated_client(cls.staff)
+    
+    @classmethod
+    def _authenticated_client(cls, user):
+        """Return an API client carrying the user's cached access token."""
+        client = cls.client_class()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {cls._tokens[user.pk]}')
+        return client
     
     def get_jwt_token(self, user):
-        """Get JWT token for user."""
-        refresh = RefreshToken.for_user(user)
-        return str(refresh.access_token)
+        """Get JWT token for user, reusing the tokens issued for fixtures."""
+        token = self._tokens.get(user.pk)
+        if token is None:
+            token = str(AccessToken.for_user(user))
+        return token
     
     def test_brand_list_system_admin(self):
         """Test that SYSTEM_ADMIN can see all brands."""
-        token = self.get_jwt_token(self.system_admin)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
-        response = self.client.get('/api/brands/')
+        response = self.admin_client.get('/api/brands/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2)
     
     def test_brand_list_brand_manager(self):
         """Test that BRAND_MANAGER can only see their own brand."""
-        token = self.get_jwt_token(self.brand_manager)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
-        response = self.client.get('/api/brands/')
+        response = self.brand_manager_client.get('/api/brands/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Brand One')
     
     def test_brand_create_system_admin_success(self):
         """Test that SYSTEM_ADMIN can create brands."""
-        token = self.get_jwt_token(self.system_admin)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
         data = {'name': 'New Brand', 'is_active': True}
-        response = self.client.post('/api/brands/', data)
+        response = self.admin_client.post('/api/brands/', data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['name'], 'New Brand')
     
-    def test_brand_create_brand_manager_forbidden(self):
-        """Test that BRAND_MANAGER cannot create brands."""
-        token = self.get_jwt_token(self.brand_manager)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
+    def test_brand_create_non_admin_forbidden(self):
+        """Test that BRAND_MANAGER, STORE_MANAGER and STAFF cannot create brands."""
         data = {'name': 'New Brand', 'is_active': True}
-        response = self.client.post('/api/brands/', data)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-    
-    def test_brand_create_store_manager_forbidden(self):
-        """Test that STORE_MANAGER cannot create brands."""
-        token = self.get_jwt_token(self.store_manager)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
-        data = {'name': 'New Brand', 'is_active': True}
-        response = self.client.post('/api/brands/', data)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-    
-    def test_brand_create_staff_forbidden(self):
-        """Test that STAFF cannot create brands."""
-        token = self.get_jwt_token(self.staff)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
-        data = {'name': 'New Brand', 'is_active': True}
-        response = self.client.post('/api/brands/', data)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        for role, client in (
+            (BRAND_MANAGER, self.brand_manager_client),
+            (STORE_MANAGER, self.store_manager_client),
+            (STAFF, self.staff_client),
+        ):
+            with self.subTest(role=role):
+                response = client.post('/api/brands/', data)
+                self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Brand.objects.filter(name='New Brand').exists())
     
     def test_brand_update_system_admin_success(self):
         """Test that SYSTEM_ADMIN can update brands."""
-        token = self.get_jwt_token(self.system_admin)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
         data = {'name': 'Updated Brand', 'is_active': False}
-        response = self.client.put(f'/api/brands/{self.brand1.id}/', data)
+        response = self.admin_client.put(f'/api/brands/{self.brand1.id}/', data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], 'Updated Brand')
         self.assertFalse(response.data['is_active'])
     
     def test_brand_update_brand_manager_forbidden(self):
         """Test that BRAND_MANAGER cannot update brands."""
-        token = self.get_jwt_token(self.brand_manager)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
         data = {'name': 'Updated Brand', 'is_active': False}
-        response = self.client.put(f'/api/brands/{self.brand1.id}/', data)
+        response = self.brand_manager_client.put(f'/api/brands/{self.brand1.id}/', data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
+    def test_brand_delete_brand_manager_forbidden(self):
+        """Test that BRAND_MANAGER cannot delete their own brand."""
+        response = self.brand_manager_client.delete(f'/api/brands/{self.brand1.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Brand.objects.filter(id=self.brand1.id).exists())
+    
     def test_brand_isolation(self):
         """Test that users from one brand cannot see another brand's data."""
         # Create another brand manager for brand2
@@ -194,28 +159,107 @@ class BrandAPITest(APITestCase):
         # Create inactive brand
         inactive_brand = Brand.objects.create(name="Inactive Brand", is_active=False)
         
-        token = self.get_jwt_token(self.system_admin)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
         # Test without filter - should return all brands
-        response = self.client.get('/api/brands/')
+        response = self.admin_client.get('/api/brands/')
         self.assertEqual(len(response.data['results']), 3)
         
         # Test with is_active=true filter
-        response = self.client.get('/api/brands/?is_active=true')
+        response = self.admin_client.get('/api/brands/?is_active=true')
         self.assertEqual(len(response.data['results']), 2)
         
         # Test with is_active=false filter
-        response = self.client.get('/api/brands/?is_active=false')
+        response = self.admin_client.get('/api/brands/?is_active=false')
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Inactive Brand')
     
     def test_brand_create_duplicate_name_case_insensitive(self):
         """Test that creating brand with duplicate name (case-insensitive) fails."""
-        token = self.get_jwt_token(self.system_admin)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
         data = {'name': 'BRAND ONE', 'is_active': True}
-        response = self.client.post('/api/brands/', data)
+        response = self.admin_client.post('/api/brands/', data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('name', response.data)
+    
+    def test_brand_create_exact_duplicate_name(self):
+        """Test that an exact duplicate name is reported on the name field."""
+        response = self.admin_client.post('/api/brands/', {'name': 'Brand One', 'is_active': True})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['name'], ['Brand name must be unique (case-insensitive).'])
+    
+    def test_brand_update_duplicate_name_case_insensitive(self):
+        """Test that renaming a brand onto another brand's name (any case) fails."""
+        data = {'name': 'brand one', 'is_active': True}
+        response = self.admin_client.put(f'/api/brands/{self.brand2.id}/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', response.data)
+        self.brand2.refresh_from_db(fields=['name'])
+        self.assertEqual(self.brand2.name, 'Brand Two')
+    
+    def test_permission_check_does_not_evaluate_view_queryset(self):
+        """Test that the permission check only reads the queryset's model."""
+        request = APIRequestFactory().get('/api/brands/')
+        request.user = self.staff
+        view = BrandViewSet()
+        view.queryset = Brand.objects.all()
+        
+        with self.assertNumQueries(0):
+            self.assertTrue(BrandScopedPermission().has_permission(request, view))
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_brand_list_is_cached_until_brand_write(self):
+        """Test that repeated list requests skip the brand query until a brand changes."""
+        response = self.admin_client.get('/api/brands/')
+        self.assertEqual(len(response.data['results']), 2)
+        
+        # Only the authenticating user lookup runs on a cache hit
+        with self.assertNumQueries(1):
+            response = self.admin_client.get('/api/brands/')
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIn('Authorization', response['Vary'])
+        
+        self.admin_client.post('/api/brands/', {'name': 'New Brand', 'is_active': True})
+        response = self.admin_client.get('/api/brands/')
+        self.assertEqual(len(response.data['results']), 3)
+    
+    @override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        ALLOWED_HOSTS=['a.example', 'b.example'],
+    )
+    def test_brand_list_cache_keys_on_host_and_sorted_query(self):
+        """Test that parameter order shares an entry while each host gets its own links."""
+        self.admin_client.get('/api/brands/?is_active=true&page=1', HTTP_HOST='a.example')
+        
+        with self.assertNumQueries(1):
+            response = self.admin_client.get('/api/brands/?page=1&is_active=true', HTTP_HOST='a.example')
+        self.assertEqual(len(response.data['results']), 2)
+        
+        with self.assertNumQueries(3):
+            self.admin_client.get('/api/brands/?is_active=true&page=1', HTTP_HOST='b.example')
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_brand_list_cache_invalidated_by_orm_write(self):
+        """Test that a brand saved outside the API, e.g. from the admin, invalidates cached lists."""
+        self.admin_client.get('/api/brands/')
+        
+        self.brand1.name = 'Renamed Brand'
+        self.brand1.save()
+        
+        response = self.admin_client.get('/api/brands/')
+        self.assertIn('Renamed Brand', {b['name'] for b in response.data['results']})
+    
+    def test_object_permission_compares_brand_ids(self):
+        """Test that the object permission check does not load the user's brand."""
+        request = APIRequestFactory().get(f'/api/brands/{self.brand1.id}/')
+        request.user = User.objects.get(pk=self.brand_manager.pk)
+        permission = BrandScopedPermission()
+        
+        with self.assertNumQueries(0):
+            self.assertTrue(permission.has_object_permission(request, None, self.brand1))
+            self.assertFalse(permission.has_object_permission(request, None, self.brand2))
+    
+    def test_request_memo_helpers_accept_anonymous_user(self):
+        """Test that the request memo helpers treat an anonymous user as unscoped."""
+        request = APIRequestFactory().get('/api/brands/')
+        request.user = AnonymousUser()
+        
+        self.assertFalse(request_is_system_admin(request))
+        self.assertIsNone(request_brand_id(request))
@@ -1,11 +1,18 @@
 """Brand views for the inventory platform."""
-from rest_framework import viewsets, status
+import hashlib
+from urllib.parse import urlencode
+from rest_framework import viewsets
 from rest_framework.response import Response
+from django.core.cache import cache
 from django.db.models import Q
-from apps.common.permissions import BrandScopedPermission
-from apps.accounts.roles import SYSTEM_ADMIN
+from django.utils.cache import patch_vary_headers
+from apps.common.permissions import BrandScopedPermission, request_brand_id, request_is_system_admin
+from apps.common.versions import get_model_versions
+from apps.common.viewsets import parse_is_active
 from .models import Brand
-from .serializers import BrandSerializer
+from .serializers import BrandSerializer, BrandReadSerializer
+
+BRAND_LIST_CACHE_TIMEOUT = 60 * 5
 
 
 class BrandViewSet(viewsets.ModelViewSet):
@@ -15,54 +22,56 @@ class BrandViewSet(viewsets.ModelViewSet):
     serializer_class = BrandSerializer
     permission_classes = [BrandScopedPermission]
     
+    def get_serializer_class(self):
+        """Return the read-only serializer for list and retrieve actions."""
+        if self.action in ('list', 'retrieve'):
+            return BrandReadSerializer
+        return BrandSerializer
+    
     def get_queryset(self):
         """Filter queryset based on user permissions."""
-        user = self.request.user
-        queryset = super().get_queryset()
+        is_admin = request_is_system_admin(self.request)
+        brand_id = request_brand_id(self.request)
+        
+        # Users without brand see nothing
+        if not is_admin and brand_id is None:
+            return Brand.objects.none()
+        
+        q = Q()
         
         # Apply is_active filter if requested
-        is_active = self.request.query_params.get('is_active')
+        is_active = parse_is_active(self.request)
         if is_active is not None:
-            if is_active.lower() == 'true':
-                queryset = queryset.filter(is_active=True)
-            elif is_active.lower() == 'false':
-                queryset = queryset.filter(is_active=False)
-        
-        # System admins see all brands
-        if user.is_system_admin():
-            return queryset
+            q &= Q(is_active=is_active)
         
         # Non-admin users only see their own brand
-        user_brand = user.get_brand()
-        if user_brand:
-            return queryset.filter(id=user_brand.id)
+        if not is_admin:
+            q &= Q(id=brand_id)
         
-        # Users without brand see nothing
-        return queryset.none()
-    
-    def create(self, request, *args, **kwargs):
-        """Only SYSTEM_ADMIN can create brands."""
-        if not request.user.is_system_admin():
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        return super().create(request, *args, **kwargs)
+        return Brand.objects.filter(q)
     
-    def update(self, request, *args, **kwargs):
-        """Handle brand updates with proper permissions."""
-        if not request.user.is_system_admin():
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        return super().update(request, *args, **kwargs)
+    def get_list_cache_key(self):
+        """
+        Build the list cache key from the caller's brand scope, the brand write version
+        and the URL the page links are built from, with query parameters in a fixed order.
+        Brand saves and deletes bump the version; queryset update() and bulk writes must
+        call bump_model_version(Brand) themselves.
+        """
+        request = self.request
+        scope = 'all' if request_is_system_admin(request) else request_brand_id(request)
+        version, = get_model_versions(Brand)
+        query = urlencode(sorted(request.GET.lists()), doseq=True)
+        url = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+        return f'brands:list:{version}:{scope}:{hashlib.md5(url.encode()).hexdigest()}'
     
-    def destroy(self, request, *args, **kwargs):
-        """Handle brand deletion with proper permissions."""
-        if not request.user.is_system_admin():
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        return super().destroy(request, *args, **kwargs)
+    def list(self, request, *args, **kwargs):
+        """List brands, serving repeated requests from the cache."""
+        cache_key = self.get_list_cache_key()
+        data = cache.get(cache_key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(cache_key, response.data, BRAND_LIST_CACHE_TIMEOUT)
+        else:
+            response = Response(data)
+        patch_vary_headers(response, ('Authorization',))
+        return response
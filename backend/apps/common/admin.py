@@ -0,0 +1,18 @@
+"""Shared admin helpers."""
+from .permissions import request_brand_id, request_is_system_admin
+
+
+class BrandScopedAdminMixin:
+    """Limit admin querysets to the requesting user's brand unless they are a system admin."""
+    
+    def get_queryset(self, request):
+        """Filter queryset based on user permissions."""
+        qs = super().get_queryset(request)
+        if request_is_system_admin(request):
+            return qs
+        
+        # Compare on the user's brand id; the Brand row itself is never needed
+        brand_id = request_brand_id(request)
+        if brand_id:
+            return qs.filter(brand_id=brand_id)
+        return qs.none()
@@ -0,0 +1,128 @@
+"""Common DRF paginators."""
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+# Below this many rows an exact COUNT(*) is cheap and always correct
+ESTIMATE_MIN_ROWS = 100000
+
+# How long a list count is reused by pages after the first
+COUNT_CACHE_TIMEOUT = 60
+
+
+def estimate_row_count(queryset):
+    """Return the planner's row estimate for an unfiltered Postgres table, or None."""
+    connection = connections[queryset.db]
+    query = queryset.query
+    if connection.vendor != 'postgresql' or query.where or query.distinct:
+        return None
+    
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    
+    # reltuples is -1 until the table has been analyzed
+    if row is None or row[0] < ESTIMATE_MIN_ROWS:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts the planner's estimate for large unfiltered tables."""
+    
+    @cached_property
+    def count(self):
+        """Return the estimated row count when available, otherwise the exact count."""
+        estimate = estimate_row_count(self.object_list)
+        if estimate is None:
+            return super().count
+        return estimate
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """Page number pagination that skips COUNT(*) on large unfiltered tables."""
+    
+    django_paginator_class = EstimatedCountPaginator
+
+
+class CachedCountPaginator(EstimatedCountPaginator):
+    """
+    Paginator that reuses a recently cached count for the same query.
+    A page on or past the cached last page, or one that comes back short, is checked
+    against an exact recount, so a stale total neither 404s a valid page nor hides rows.
+    """
+    
+    def __init__(self, *args, refresh_count=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.refresh_count = refresh_count
+        self.count_from_cache = False
+    
+    @cached_property
+    def count(self):
+        """Return the cached count for this query, computing and storing it when missing or refreshed."""
+        # Key on the filters alone; columns, joins and ordering do not change the count
+        try:
+            sql, params = self.object_list.order_by().values('pk').query.sql_with_params()
+        except EmptyResultSet:
+            return super().count
+        
+        digest = hashlib.blake2b(f'{self.object_list.db}:{sql}:{params}'.encode(), digest_size=16)
+        cache_key = f'pagination:count:{digest.hexdigest()}'
+        if not self.refresh_count:
+            count = cache.get(cache_key)
+            if count is not None:
+                self.count_from_cache = True
+                return count
+        
+        count = super().count
+        cache.set(cache_key, count, COUNT_CACHE_TIMEOUT)
+        return count
+    
+    def page(self, number):
+        """Return page `number`, recounting first when a cached total puts it on or past the last page."""
+        try:
+            valid = self.validate_number(number)
+        except EmptyPage:
+            if not self.count_from_cache:
+                raise
+            valid = None
+        if self.count_from_cache and (valid is None or valid >= self.num_pages):
+            self.recount()
+        page = super().page(number)
+        
+        # A short page before the cached last page means rows were deleted since the count
+        if self.count_from_cache and len(page) < self.per_page:
+            self.recount()
+            page = super().page(number)
+        return page
+    
+    def recount(self):
+        """Discard the cached total so the next read runs and caches an exact count."""
+        self.refresh_count = True
+        self.count_from_cache = False
+        for name in ('count', 'num_pages'):
+            self.__dict__.pop(name, None)
+
+
+class CachedCountPagination(EstimatedCountPagination):
+    """
+    Page number pagination that caches list counts briefly.
+    The first page always recounts, so a cached total is never older than the last visit to page one.
+    """
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate, recounting only when the first page is requested."""
+        self.refresh_count = str(self.get_page_number(request, None)) == '1'
+        return super().paginate_queryset(queryset, request, view)
+    
+    def django_paginator_class(self, queryset, page_size):
+        """Build the paginator DRF asks for, passing along whether to recount."""
+        return CachedCountPaginator(queryset, page_size, refresh_count=self.refresh_count)
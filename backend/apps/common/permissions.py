@@ -1,12 +1,46 @@
 """Common permission decorators and utilities."""
 
+import uuid
 from functools import wraps
 from django.http import JsonResponse
-from django.contrib.auth import get_user_model
-from rest_framework import permissions
+from rest_framework import exceptions, permissions
 from apps.accounts.roles import SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER, STAFF
 
-User = get_user_model()
+
+def request_is_system_admin(request):
+    """Return whether the requesting user is a system admin, memoized on the request."""
+    try:
+        return request._is_sys_admin
+    except AttributeError:
+        # AnonymousUser has no role; callers may run before authentication is enforced
+        request._is_sys_admin = getattr(request.user, 'role', None) == SYSTEM_ADMIN
+        return request._is_sys_admin
+
+
+def request_brand_id(request):
+    """Return the requesting user's brand id, memoized on the request."""
+    try:
+        return request._cached_brand_id
+    except AttributeError:
+        request._cached_brand_id = getattr(request.user, 'brand_id', None)
+        return request._cached_brand_id
+
+
+def _names_brand(value, brand_id):
+    """Return True if a submitted brand value parses to the UUID `brand_id`."""
+    if not isinstance(value, uuid.UUID):
+        try:
+            value = uuid.UUID(value)
+        except (AttributeError, TypeError, ValueError):
+            return False
+    return value == brand_id
+
+
+def _object_brand_id(obj):
+    """Return the brand id an object belongs to without loading the brand."""
+    if obj.__class__.__name__ == 'Brand':
+        return obj.pk
+    return getattr(obj, 'brand_id', None)
 
 
 def require_roles(*allowed_roles):
@@ -14,6 +48,8 @@ def require_roles(*allowed_roles):
     Decorator that restricts access to users with specific roles.
     Returns 403 JSON response for unauthorized access.
     """
+    allowed = frozenset(allowed_roles)
+    
     def decorator(view_func):
         @wraps(view_func)
         def wrapped_view(request, *args, **kwargs):
@@ -25,7 +61,7 @@ def require_roles(*allowed_roles):
                 )
             
             # Check if user has required role
-            if not request.user.has_role(*allowed_roles):
+            if request.user.role not in allowed:
                 return JsonResponse(
                     {"detail": "forbidden", "code": "PERMISSION_DENIED"}, 
                     status=403
@@ -51,7 +87,7 @@ class RequireRolesMixin:
             )
         
         # Check if user has required role
-        if self.required_roles and not request.user.has_role(*self.required_roles):
+        if self.required_roles and request.user.role not in self.required_roles:
             return JsonResponse(
                 {"detail": "forbidden", "code": "PERMISSION_DENIED"}, 
                 status=403
@@ -60,6 +96,31 @@ class RequireRolesMixin:
         return super().dispatch(request, *args, **kwargs)
 
 
+class RoleGatedViewSetMixin:
+    """
+    Viewset mixin that gates actions by role through the `action_roles` table.
+    Non-admin creates must also name the caller's own brand on every submitted item.
+    """
+    action_roles = {}
+    
+    def check_permissions(self, request):
+        """Run the permission classes, then the role table and the create brand check."""
+        super().check_permissions(request)
+        
+        allowed_roles = self.action_roles.get(self.action)
+        if allowed_roles is not None and request.user.role not in allowed_roles:
+            raise exceptions.PermissionDenied({"detail": "forbidden", "code": "PERMISSION_DENIED"})
+        
+        if self.action == 'create' and not request_is_system_admin(request):
+            user_brand_id = request_brand_id(request)
+            items = request.data if isinstance(request.data, list) else [request.data]
+            if not user_brand_id or any(
+                not hasattr(item, 'get') or not _names_brand(item.get('brand'), user_brand_id)
+                for item in items
+            ):
+                raise exceptions.PermissionDenied({"detail": "forbidden", "code": "PERMISSION_DENIED"})
+
+
 class BrandPermission(permissions.BasePermission):
     """
     Custom permission class for brand-based access control.
@@ -71,13 +132,13 @@ class BrandPermission(permissions.BasePermission):
             return False
         
         # System admins have full access
-        if request.user.is_system_admin():
+        if request_is_system_admin(request):
             return True
         
         # For non-admin users, check role-specific permissions
         if hasattr(view, 'get_required_permissions'):
             required_permissions = view.get_required_permissions(request.method)
-            return request.user.has_role(*required_permissions)
+            return request.user.role in required_permissions
         
         return False
     
@@ -87,24 +148,15 @@ class BrandPermission(permissions.BasePermission):
             return False
         
         # System admins have full access
-        if request.user.is_system_admin():
+        if request_is_system_admin(request):
             return True
         
         # Check if object belongs to user's brand
-        user_brand = request.user.get_brand()
-        if not user_brand:
+        user_brand_id = request_brand_id(request)
+        if user_brand_id is None:
             return False
         
-        # Get object's brand
-        obj_brand = None
-        if hasattr(obj, 'brand'):
-            obj_brand = obj.brand
-        elif hasattr(obj, 'brand_id'):
-            obj_brand = obj.brand
-        elif obj.__class__.__name__ == 'Brand':
-            obj_brand = obj
-        
-        return obj_brand == user_brand
+        return _object_brand_id(obj) == user_brand_id
 
 
 class BrandScopedPermission(permissions.BasePermission):
@@ -114,41 +166,43 @@ class BrandScopedPermission(permissions.BasePermission):
     
     # Role-based permissions matrix
     ROLE_PERMISSIONS = {
-        SYSTEM_ADMIN: ['GET', 'POST', 'PUT', 'PATCH', 'DELETE'],
-        BRAND_MANAGER: ['GET', 'POST', 'PUT', 'PATCH', 'DELETE'],
-        STORE_MANAGER: ['GET', 'PUT', 'PATCH'],  # Can only read and update, not create/delete
-        STAFF: ['GET'],  # Read-only
+        SYSTEM_ADMIN: frozenset({'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}),
+        BRAND_MANAGER: frozenset({'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}),
+        STORE_MANAGER: frozenset({'GET', 'PUT', 'PATCH'}),  # Can only read and update, not create/delete
+        STAFF: frozenset({'GET'}),  # Read-only
     }
     
     # Model-specific permission overrides
     MODEL_PERMISSIONS = {
         'Brand': {
-            SYSTEM_ADMIN: ['GET', 'POST', 'PUT', 'PATCH', 'DELETE'],
-            BRAND_MANAGER: ['GET'],  # Cannot create/modify brands
-            STORE_MANAGER: ['GET'],
-            STAFF: ['GET'],
+            SYSTEM_ADMIN: frozenset({'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}),
+            BRAND_MANAGER: frozenset({'GET'}),  # Cannot create/modify brands
+            STORE_MANAGER: frozenset({'GET'}),
+            STAFF: frozenset({'GET'}),
         },
         'Store': {
-            STORE_MANAGER: ['GET', 'PUT', 'PATCH'],  # Can manage their own stores
+            STORE_MANAGER: frozenset({'GET', 'PUT', 'PATCH'}),  # Can manage their own stores
         }
     }
     
     def has_permission(self, request, view):
         """Check if user has permission for the action."""
-        if not request.user.is_authenticated:
+        user = request.user
+        if not user.is_authenticated:
             return False
         
-        # Get model name
-        model_name = getattr(view, 'queryset', None)
-        if model_name:
-            model_name = model_name.model.__name__
+        # Get model name without evaluating the view's queryset
+        queryset = getattr(view, 'queryset', None)
+        model_name = queryset.model.__name__ if queryset is not None else None
+        
+        request._is_sys_admin = user.role == SYSTEM_ADMIN
         
         # Get permissions for user role and model
-        role_permissions = self.ROLE_PERMISSIONS.get(request.user.role, [])
-        model_permissions = self.MODEL_PERMISSIONS.get(model_name, {})
-        final_permissions = model_permissions.get(request.user.role, role_permissions)
+        allowed = self.MODEL_PERMISSIONS.get(model_name, {}).get(user.role)
+        if allowed is None:
+            allowed = self.ROLE_PERMISSIONS.get(user.role, frozenset())
         
-        return request.method in final_permissions
+        return request.method in allowed
     
     def has_object_permission(self, request, view, obj):
         """Check if user has permission to access specific object."""
@@ -156,19 +210,12 @@ class BrandScopedPermission(permissions.BasePermission):
             return False
         
         # System admins have full access
-        if request.user.is_system_admin():
+        if request_is_system_admin(request):
             return True
         
         # Check brand scoping for non-admin users
-        user_brand = request.user.get_brand()
-        if not user_brand:
+        user_brand_id = request_brand_id(request)
+        if user_brand_id is None:
             return False
         
-        # Get object's brand
-        obj_brand = None
-        if hasattr(obj, 'brand'):
-            obj_brand = obj.brand
-        elif obj.__class__.__name__ == 'Brand':
-            obj_brand = obj
-        
-        return obj_brand == user_brand
\ No newline at end of file
+        return _object_brand_id(obj) == user_brand_id
@@ -0,0 +1,30 @@
+"""Common DRF renderers."""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+    Falls back to the stock renderer when indented output is requested.
+    """
+
+    def __init__(self):
+        self._default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON bytes."""
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Non-str keys (e.g. UUIDs) are stringified rather than rejected
+        ret = orjson.dumps(
+            data, default=self._default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
+
+        # Keep the output a strict javascript subset like JSONRenderer does
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,67 @@
+"""Common serializer mixins."""
+from contextlib import contextmanager
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, transaction
+from django.utils.text import capfirst
+from rest_framework import serializers
+
+
+def unique_conflict_error(exc, model, conflict_fields):
+    """
+    Return a field ValidationError for an IntegrityError raised by one of `model`'s
+    unique constraints named in `conflict_fields`, or None for any other violation.
+    A key of `conflict_fields` may also name a unique=True model field.
+    """
+    message = str(exc)
+    for constraint in model._meta.constraints:
+        if constraint.name in conflict_fields and constraint.name in message:
+            return serializers.ValidationError({
+                conflict_fields[constraint.name]: [constraint.violation_error_message]
+            })
+    
+    # Column indexes are unnamed: SQLite reports table.column, PostgreSQL "Key (column)="
+    for name, field_name in conflict_fields.items():
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if f'{model._meta.db_table}.{field.column}' in message or f'Key ({field.column})=' in message:
+            return serializers.ValidationError({
+                field_name: [field.error_messages['unique'] % {
+                    'model_name': capfirst(model._meta.verbose_name),
+                    'field_label': field.verbose_name,
+                }]
+            })
+    return None
+
+
+class UniqueConflictMixin:
+    """
+    Save inside a savepoint and report a unique-constraint violation on the field
+    `conflict_fields` maps the constraint's name to; other IntegrityErrors propagate.
+    """
+    
+    conflict_fields = {}
+    
+    def create(self, validated_data):
+        """Create the instance, mapping unique violations to field errors."""
+        with self.unique_conflicts():
+            return super().create(validated_data)
+    
+    def update(self, instance, validated_data):
+        """Update the instance, mapping unique violations to field errors."""
+        with self.unique_conflicts():
+            return super().update(instance, validated_data)
+    
+    @contextmanager
+    def unique_conflicts(self):
+        """Run the block in a savepoint, re-raising known unique violations as field errors."""
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError as exc:
+            error = unique_conflict_error(exc, self.Meta.model, self.conflict_fields)
+            if error is None:
+                raise
+            raise error from exc
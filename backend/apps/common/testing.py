@@ -0,0 +1,52 @@
+"""Shared test fixtures."""
+from functools import cache
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from apps.accounts.roles import BRAND_MANAGER, STAFF, STORE_MANAGER, SYSTEM_ADMIN
+from apps.brands.models import Brand
+
+TEST_PASSWORD = 'TestPassword123!'
+
+
+@cache
+def hashed_test_password():
+    """Hash the test password on first use, so the fixtures can be bulk-created."""
+    return make_password(TEST_PASSWORD)
+
+
+class BrandRoleTestData:
+    """
+    Test case mixin creating two brands and one user per role once per class.
+    Every user but the system admin belongs to `brand1`.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Create the brands and role users shared by every test in the class."""
+        super().setUpTestData()
+        cls.brand1, cls.brand2 = Brand.objects.bulk_create([
+            Brand(name="Brand One"),
+            Brand(name="Brand Two"),
+        ])
+        cls.system_admin, cls.brand_manager, cls.store_manager, cls.staff = (
+            get_user_model().objects.bulk_create([
+                cls.role_user("admin@test.com", SYSTEM_ADMIN, None, "System", "Admin"),
+                cls.role_user("manager@test.com", BRAND_MANAGER, cls.brand1, "Brand", "Manager"),
+                cls.role_user("store@test.com", STORE_MANAGER, cls.brand1, "Store", "Manager"),
+                cls.role_user("staff@test.com", STAFF, cls.brand1, "Staff", "User"),
+            ])
+        )
+    
+    @classmethod
+    def role_user(cls, email, role, brand, first_name, last_name):
+        """Return an unsaved user carrying the pre-hashed test password."""
+        return get_user_model()(
+            email=email,
+            password=hashed_test_password(),
+            role=role,
+            brand=brand,
+            first_name=first_name,
+            last_name=last_name,
+        )
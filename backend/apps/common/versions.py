@@ -0,0 +1,46 @@
+"""Cache-backed write versions for models whose rows back cached or validated lists."""
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+
+def version_key(model):
+    """Return the cache key holding `model`'s write version."""
+    return f'versions:{model._meta.label_lower}'
+
+
+def new_version():
+    """Return a version that no earlier value of any key can carry."""
+    return time.time_ns()
+
+
+def get_model_versions(*models):
+    """Return the current write version of each model, seeding missing ones in one call."""
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """
+    Invalidate everything derived from `model`'s rows.
+    Saves and deletes bump automatically once the model is tracked; queryset
+    update() and bulk_create() send no signals, so their callers must bump.
+    """
+    cache.set(version_key(model), new_version(), None)
+
+
+def _bump_sender_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def track_model_versions(*models):
+    """Bump each model's version whenever one of its rows is saved or deleted."""
+    for model in models:
+        post_save.connect(_bump_sender_version, sender=model, dispatch_uid=version_key(model))
+        post_delete.connect(_bump_sender_version, sender=model, dispatch_uid=version_key(model))
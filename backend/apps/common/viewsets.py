@@ -0,0 +1,42 @@
+"""Common viewset mixins."""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+
+from .versions import get_model_versions
+
+# Accepted values for the ?is_active= query parameter
+IS_ACTIVE_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def parse_is_active(request):
+    """Return the request's ?is_active= filter as a bool, or None when absent or unrecognized."""
+    return IS_ACTIVE_VALUES.get((request.query_params.get('is_active') or '').lower())
+
+
+class ListETagMixin:
+    """
+    Viewset mixin that answers unchanged list polls with 304 Not Modified.
+    The validator is built from cached write versions of the listed model and of
+    the models in `etag_models` whose fields the list also renders, so it costs
+    no database query. Those models must be registered with track_model_versions().
+    """
+    
+    etag_models = ()
+    
+    def get_list_etag(self, request):
+        """Build a weak ETag from the caller, the query string and the models' write versions."""
+        versions = get_model_versions(self.queryset.model, *self.etag_models)
+        parts = [request.user.pk, request.META.get('QUERY_STRING', ''), *versions]
+        key = ':'.join(str(part) for part in parts)
+        return 'W/' + quote_etag(hashlib.md5(key.encode()).hexdigest())
+    
+    def list(self, request, *args, **kwargs):
+        """List rows, skipping the page query and serialization when the client's copy is current."""
+        etag = self.get_list_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        response.headers['ETag'] = etag
+        patch_vary_headers(response, ['Authorization'])
+        return response
@@ -1,13 +1,28 @@
 """Product and Category admin configuration."""
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from apps.common.admin import BrandScopedAdminMixin
 from .models import Category, Product
 
 
+class ColumnLimitedChangeList(ChangeList):
+    """Changelist that loads only the model admin's `list_only` columns."""
+    
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).only(*self.model_admin.list_only)
+
+
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(BrandScopedAdminMixin, admin.ModelAdmin):
     """Admin interface for Category model."""
     
     list_display = ['name', 'brand', 'parent', 'created_at']
+    list_select_related = ['brand', 'parent', 'parent__brand', 'parent__parent']
+    list_only = [
+        'id', 'name', 'created_at', 'brand', 'brand__name',
+        'parent', 'parent__name', 'parent__brand', 'parent__brand__name',
+        'parent__parent', 'parent__parent__name',
+    ]
     list_filter = ['brand', 'created_at']
     search_fields = ['name', 'brand__name']
     readonly_fields = ['id', 'created_at', 'updated_at']
@@ -22,25 +37,26 @@ class CategoryAdmin(admin.ModelAdmin):
         }),
     )
     
-    def get_queryset(self, request):
-        """Filter queryset based on user permissions."""
-        qs = super().get_queryset(request)
-        if not request.user.is_system_admin():
-            user_brand = request.user.get_brand()
-            if user_brand:
-                qs = qs.filter(brand=user_brand)
-            else:
-                qs = qs.none()
-        return qs
+    def get_changelist(self, request, **kwargs):
+        """Use a changelist that skips columns the list page never renders."""
+        return ColumnLimitedChangeList
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(BrandScopedAdminMixin, admin.ModelAdmin):
     """Admin interface for Product model."""
     
     list_display = ['name', 'sku', 'brand', 'category', 'is_active', 'created_at']
+    list_select_related = ['brand', 'category', 'category__brand', 'category__parent']
+    list_only = [
+        'id', 'sku', 'name', 'is_active', 'created_at', 'brand', 'brand__name',
+        'category', 'category__name', 'category__brand', 'category__brand__name',
+        'category__parent', 'category__parent__name',
+    ]
     list_filter = ['brand', 'category', 'is_active', 'created_at']
     search_fields = ['name', 'sku', 'brand__name']
+    # Searches scan the table; skip the second, unfiltered COUNT(*) on every result page
+    show_full_result_count = False
     readonly_fields = ['id', 'created_at', 'updated_at']
     
     fieldsets = (
@@ -53,13 +69,6 @@ class ProductAdmin(admin.ModelAdmin):
         }),
     )
     
-    def get_queryset(self, request):
-        """Filter queryset based on user permissions."""
-        qs = super().get_queryset(request)
-        if not request.user.is_system_admin():
-            user_brand = request.user.get_brand()
-            if user_brand:
-                qs = qs.filter(brand=user_brand)
-            else:
-                qs = qs.none()
-        return qs
+    def get_changelist(self, request, **kwargs):
+        """Use a changelist that skips columns the list page never renders."""
+        return ColumnLimitedChangeList
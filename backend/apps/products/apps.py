@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.products"
+    
+    def ready(self):
+        from apps.common.versions import track_model_versions
+        
+        track_model_versions(self.get_model('Category'), self.get_model('Product'))
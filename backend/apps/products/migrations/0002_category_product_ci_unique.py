@@ -0,0 +1,41 @@
+# Generated by Django 5.0.8 on 2026-10-15 09:47
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0003_brand_active_created_idx"),
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="category",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="product",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="category",
+            constraint=models.UniqueConstraint(
+                models.F("brand"),
+                django.db.models.functions.text.Lower("name"),
+                name="category_brand_name_ci_unique",
+                violation_error_message="Category name must be unique within the brand (case-insensitive).",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="product",
+            constraint=models.UniqueConstraint(
+                models.F("brand"),
+                django.db.models.functions.text.Lower("sku"),
+                name="product_brand_sku_ci_unique",
+                violation_error_message="Product SKU must be unique within the brand (case-insensitive).",
+            ),
+        ),
+    ]
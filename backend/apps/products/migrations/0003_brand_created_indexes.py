@@ -0,0 +1,28 @@
+# Generated by Django 5.0.8 on 2026-10-15 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0003_brand_active_created_idx"),
+        ("products", "0002_category_product_ci_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["brand", "-created_at"], name="category_brand_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["brand", "-created_at"], name="product_brand_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["brand", "is_active", "-created_at"], name="product_brand_active_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,7 @@
 """Product and Category models for the inventory platform."""
-from django.db import models
+from django.db import connections, models, router
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.core.exceptions import ValidationError
 from apps.common.models import BaseModel
 from apps.brands.models import Brand
@@ -17,42 +19,89 @@ class Category(BaseModel):
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
         ordering = ['-created_at']
-        unique_together = [('brand', 'name')]
+        indexes = [
+            # Brand-scoped list in default ordering
+            models.Index(fields=['brand', '-created_at'], name='category_brand_created_idx'),
+        ]
+        constraints = [
+            # Case-insensitive name uniqueness per brand, enforced by a unique expression index
+            models.UniqueConstraint(
+                F('brand'), Lower('name'),
+                name='category_brand_name_ci_unique',
+                violation_error_message='Category name must be unique within the brand (case-insensitive).',
+            ),
+        ]
     
     def __str__(self):
         if self.parent:
             return f"{self.brand.name} - {self.parent.name} > {self.name}"
         return f"{self.brand.name} - {self.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded column values so validation can skip unchanged fields."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def has_changed(self, attname):
+        """Return True unless `attname` still holds the value it was loaded with."""
+        loaded = getattr(self, '_loaded_values', {})
+        return attname not in loaded or loaded[attname] != getattr(self, attname)
+    
     def clean(self):
         """Custom validation for category fields."""
         super().clean()
-        if self.brand_id:
-            # Check name uniqueness per brand (case-insensitive)
-            name_exists = Category.objects.filter(
-                brand=self.brand,
-                name__iexact=self.name
-            ).exclude(pk=self.pk).exists()
-            
-            if name_exists:
-                raise ValidationError({'name': 'Category name must be unique within the brand (case-insensitive).'})
-        
-        # Prevent circular references in parent-child relationships
-        if self.parent and self.pk:
-            if self.parent == self:
-                raise ValidationError({'parent': 'Category cannot be its own parent.'})
-            
-            # Check for circular reference (more complex check)
-            parent = self.parent
-            while parent:
-                if parent.pk == self.pk:
-                    raise ValidationError({'parent': 'Circular reference detected in category hierarchy.'})
-                parent = parent.parent
+        self.check_parent()
     
     def save(self, *args, **kwargs):
-        """Override save to run validation."""
-        self.clean()
+        """Refuse a parent that would close a cycle, so ORM writes keep the hierarchy a tree."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'parent' in update_fields or 'parent_id' in update_fields:
+            self.check_parent()
         super().save(*args, **kwargs)
+    
+    def check_parent(self):
+        """Raise ValidationError if the parent is this category or one of its descendants."""
+        if not self.parent_id:
+            return
+        if self.parent_id == self.pk:
+            raise ValidationError({'parent': 'Category cannot be its own parent.'})
+        
+        # A new category has no descendants, and an unchanged parent was checked when stored
+        if not self._state.adding and self.has_changed('parent_id') and self.is_ancestor(self.parent):
+            raise ValidationError({'parent': 'Circular reference detected in category hierarchy.'})
+    
+    def validate_constraints(self, exclude=None):
+        """Skip the name-uniqueness query when neither brand nor name changed since loading."""
+        if not self.has_changed('name') and not self.has_changed('brand_id'):
+            exclude = set(exclude or ()) | {'name'}
+        super().validate_constraints(exclude=exclude)
+    
+    def is_ancestor(self, category):
+        """Return True if this category appears in `category`'s ancestor chain (or is it)."""
+        if category is None:
+            return False
+        if category.pk == self.pk:
+            return True
+        
+        # Walk the whole ancestor chain in one recursive query; UNION stops on bad cycles
+        connection = connections[self._state.db or router.db_for_read(Category, instance=self)]
+        table = connection.ops.quote_name(self._meta.db_table)
+        pk_field = self._meta.pk
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH RECURSIVE ancestors(id, parent_id) AS ('
+                f'SELECT id, parent_id FROM {table} WHERE id = %s '
+                f'UNION SELECT c.id, c.parent_id FROM {table} c '
+                f'JOIN ancestors a ON c.id = a.parent_id'
+                f') SELECT 1 FROM ancestors WHERE id = %s LIMIT 1',
+                [
+                    pk_field.get_db_prep_value(category.pk, connection),
+                    pk_field.get_db_prep_value(self.pk, connection),
+                ],
+            )
+            return cursor.fetchone() is not None
 
 
 class Product(BaseModel):
@@ -69,7 +118,19 @@ class Product(BaseModel):
         verbose_name = 'Product'
         verbose_name_plural = 'Products'
         ordering = ['-created_at']
-        unique_together = [('brand', 'sku')]
+        indexes = [
+            # Brand-scoped list in default ordering, with and without ?is_active=
+            models.Index(fields=['brand', '-created_at'], name='product_brand_created_idx'),
+            models.Index(fields=['brand', 'is_active', '-created_at'], name='product_brand_active_idx'),
+        ]
+        constraints = [
+            # Case-insensitive SKU uniqueness per brand, enforced by a unique expression index
+            models.UniqueConstraint(
+                F('brand'), Lower('sku'),
+                name='product_brand_sku_ci_unique',
+                violation_error_message='Product SKU must be unique within the brand (case-insensitive).',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.brand.name} - {self.name} ({self.sku})"
@@ -77,21 +138,16 @@ class Product(BaseModel):
     def clean(self):
         """Custom validation for product fields."""
         super().clean()
-        if self.brand_id:
-            # Check SKU uniqueness per brand (case-insensitive)
-            sku_exists = Product.objects.filter(
-                brand=self.brand,
-                sku__iexact=self.sku
-            ).exclude(pk=self.pk).exists()
-            
-            if sku_exists:
-                raise ValidationError({'sku': 'Product SKU must be unique within the brand (case-insensitive).'})
-        
-        # Validate category belongs to same brand
-        if self.category and self.brand_id and self.category.brand_id != self.brand_id:
-            raise ValidationError({'category': 'Category must belong to the same brand as the product.'})
+        self.check_category_brand()
     
     def save(self, *args, **kwargs):
-        """Override save to run validation."""
-        self.clean()
+        """Refuse a category from another brand, so ORM writes keep products brand-consistent."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'brand', 'brand_id', 'category', 'category_id'} & set(update_fields):
+            self.check_category_brand()
         super().save(*args, **kwargs)
+    
+    def check_category_brand(self):
+        """Raise ValidationError if the category belongs to another brand."""
+        if self.category_id and self.brand_id and self.category.brand_id != self.brand_id:
+            raise ValidationError({'category': 'Category must belong to the same brand as the product.'})
@@ -1,45 +1,115 @@
 """Product and Category serializers for the inventory platform."""
+from django.db import connections, router
+from django.db.models.functions import Lower
 from rest_framework import serializers
 from .models import Category, Product
-from apps.brands.serializers import BrandSerializer
+from apps.brands.serializers import BrandReadSerializer
+from apps.common.serializers import UniqueConflictMixin
+from apps.common.versions import bump_model_version
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """Create many brand-scoped rows with set-based conflict checks and batched inserts."""
+    
+    batch_size = 500
+    
+    def to_internal_value(self, data):
+        """Validate each item, then reject (brand, lowercased conflict field) clashes per item."""
+        validated_data = super().to_internal_value(data)
+        model = self.child.Meta.model
+        # Brand-scoped models carry a single per-brand unique field
+        (constraint_name, field), = self.child.conflict_fields.items()
+        message = next(
+            c.violation_error_message for c in model._meta.constraints if c.name == constraint_name
+        )
+        lowered = self.db_lower([attrs[field] for attrs in validated_data])
+        keys = [(attrs['brand'].pk, value) for attrs, value in zip(validated_data, lowered)]
+        
+        # Keys already stored, extended with each key as the payload claims it
+        taken = set(
+            model.objects.filter(brand_id__in={brand_id for brand_id, _ in keys})
+            .annotate(lowered=Lower(field))
+            .filter(lowered__in={value for _, value in keys})
+            .values_list('brand_id', 'lowered')
+        )
+        errors = []
+        for key in keys:
+            errors.append({field: [message]} if key in taken else {})
+            taken.add(key)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return validated_data
+    
+    def db_lower(self, values):
+        """Lowercase `values` with the database's LOWER(), the function the unique indexes use."""
+        connection = connections[router.db_for_write(self.child.Meta.model)]
+        lowered = []
+        with connection.cursor() as cursor:
+            for start in range(0, len(values), self.batch_size):
+                chunk = values[start:start + self.batch_size]
+                cursor.execute('SELECT ' + ', '.join(['LOWER(%s)'] * len(chunk)), chunk)
+                lowered.extend(cursor.fetchone())
+        return lowered
+    
+    def create(self, validated_data):
+        """Insert the validated rows in batches."""
+        model = self.child.Meta.model
+        with self.child.unique_conflicts():
+            instances = model.objects.bulk_create(
+                [model(**attrs) for attrs in validated_data], batch_size=self.batch_size
+            )
+        # bulk_create sends no post_save, so invalidate list validators here
+        bump_model_version(model)
+        return instances
+
+
+class CategoryBulkCreateListSerializer(BulkCreateListSerializer):
+    """Bulk create categories, which start out without children."""
+    
+    def create(self, validated_data):
+        """Bulk insert the categories and set their child count without querying."""
+        categories = super().create(validated_data)
+        for category in categories:
+            category.children_count = 0
+        return categories
+
+
+class CategorySerializer(UniqueConflictMixin, serializers.ModelSerializer):
     """Serializer for Category model."""
     
     brand_name = serializers.CharField(source='brand.name', read_only=True)
     parent_name = serializers.CharField(source='parent.name', read_only=True)
-    children_count = serializers.IntegerField(source='children.count', read_only=True)
+    children_count = serializers.SerializerMethodField()
+    
+    conflict_fields = {'category_brand_name_ci_unique': 'name'}
     
     class Meta:
         model = Category
-        fields = [
+        fields = (
             'id', 'brand', 'brand_name', 'name', 'parent', 'parent_name', 
             'children_count', 'created_at', 'updated_at'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        )
+        read_only_fields = ('id', 'created_at', 'updated_at')
+        list_serializer_class = CategoryBulkCreateListSerializer
+    
+    def get_children_count(self, obj):
+        """Return the annotated or prefetched child count, counting in SQL only when both are missing."""
+        count = getattr(obj, 'children_count', None)
+        if count is None:
+            prefetched = getattr(obj, '_prefetched_objects_cache', {})
+            if 'children' in prefetched:
+                count = len(prefetched['children'])
+            else:
+                count = obj.children.count()
+        return count
     
     def validate(self, attrs):
         """Validate category data."""
         brand = attrs.get('brand')
-        name = attrs.get('name')
         parent = attrs.get('parent')
         
-        if brand and name:
-            # Check name uniqueness per brand (case-insensitive)
-            instance_pk = self.instance.pk if self.instance else None
-            name_exists = Category.objects.filter(
-                brand=brand,
-                name__iexact=name
-            ).exclude(pk=instance_pk).exists()
-            
-            if name_exists:
-                raise serializers.ValidationError({
-                    'name': 'Category name must be unique within the brand (case-insensitive).'
-                })
-        
-        # Validate parent belongs to same brand
-        if parent and brand and parent.brand != brand:
+        # Validate parent belongs to same brand, comparing ids so parent.brand is not loaded
+        if parent and brand and parent.brand_id != brand.pk:
             raise serializers.ValidationError({
                 'parent': 'Parent category must belong to the same brand.'
             })
@@ -50,55 +120,53 @@ class CategorySerializer(serializers.ModelSerializer):
                 'parent': 'Category cannot be its own parent.'
             })
         
+        # An unchanged parent was already checked when it was stored
+        if (
+            parent and self.instance and parent.pk != self.instance.parent_id
+            and self.instance.is_ancestor(parent)
+        ):
+            raise serializers.ValidationError({
+                'parent': 'Circular reference detected in category hierarchy.'
+            })
+        
         return attrs
 
 
 class CategoryDetailSerializer(CategorySerializer):
     """Detailed serializer for Category model with brand and parent details."""
     
-    brand = BrandSerializer(read_only=True)
+    brand = BrandReadSerializer(read_only=True)
     parent = CategorySerializer(read_only=True)
     children = CategorySerializer(many=True, read_only=True)
     
     class Meta(CategorySerializer.Meta):
-        fields = CategorySerializer.Meta.fields + ['children']
+        fields = CategorySerializer.Meta.fields + ('children',)
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(UniqueConflictMixin, serializers.ModelSerializer):
     """Serializer for Product model."""
     
     brand_name = serializers.CharField(source='brand.name', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     
+    conflict_fields = {'product_brand_sku_ci_unique': 'sku'}
+    
     class Meta:
         model = Product
-        fields = [
+        fields = (
             'id', 'brand', 'brand_name', 'sku', 'name', 'category', 
             'category_name', 'is_active', 'created_at', 'updated_at'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        )
+        read_only_fields = ('id', 'created_at', 'updated_at')
+        list_serializer_class = BulkCreateListSerializer
     
     def validate(self, attrs):
         """Validate product data."""
         brand = attrs.get('brand')
-        sku = attrs.get('sku')
         category = attrs.get('category')
         
-        if brand and sku:
-            # Check SKU uniqueness per brand (case-insensitive)
-            instance_pk = self.instance.pk if self.instance else None
-            sku_exists = Product.objects.filter(
-                brand=brand,
-                sku__iexact=sku
-            ).exclude(pk=instance_pk).exists()
-            
-            if sku_exists:
-                raise serializers.ValidationError({
-                    'sku': 'Product SKU must be unique within the brand (case-insensitive).'
-                })
-        
-        # Validate category belongs to same brand
-        if category and brand and category.brand != brand:
+        # Validate category belongs to same brand, comparing ids so category.brand is not loaded
+        if category and brand and category.brand_id != brand.pk:
             raise serializers.ValidationError({
                 'category': 'Category must belong to the same brand as the product.'
             })
@@ -106,10 +174,34 @@ class ProductSerializer(serializers.ModelSerializer):
         return attrs
 
 
+# Formats timestamps the same way the ModelSerializer fields do
+TIMESTAMP_FIELD = serializers.DateTimeField()
+
+
+class ProductListSerializer(serializers.Serializer):
+    """Read-only serializer building product list rows straight from model attributes."""
+    
+    def to_representation(self, obj):
+        """Return the ProductSerializer row for `obj` without per-field dispatch."""
+        to_timestamp = TIMESTAMP_FIELD.to_representation
+        return {
+            'id': str(obj.id),
+            'brand': obj.brand_id,
+            'brand_name': obj.brand.name,
+            'sku': obj.sku,
+            'name': obj.name,
+            'category': obj.category_id,
+            'category_name': obj.category.name if obj.category_id else None,
+            'is_active': obj.is_active,
+            'created_at': to_timestamp(obj.created_at),
+            'updated_at': to_timestamp(obj.updated_at),
+        }
+
+
 class ProductDetailSerializer(ProductSerializer):
     """Detailed serializer for Product model with brand and category details."""
     
-    brand = BrandSerializer(read_only=True)
+    brand = BrandReadSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     
     class Meta(ProductSerializer.Meta):
@@ -1,6 +1,9 @@
 """Tests for Product and Category models and API endpoints."""
 import json
-from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
@@ -8,7 +11,9 @@ from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.accounts.roles import SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER, STAFF
 from apps.brands.models import Brand
+from apps.common.testing import BrandRoleTestData
 from .models import Category, Product
+from .serializers import CategorySerializer, ProductListSerializer, ProductSerializer
 
 User = get_user_model()
 
@@ -16,9 +21,10 @@ User = get_user_model()
 class CategoryModelTest(TestCase):
     """Test Category model functionality."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.brand = Brand.objects.create(name="Test Brand")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.brand = Brand.objects.create(name="Test Brand")
     
     def test_category_creation(self):
         """Test creating a category."""
@@ -60,15 +66,58 @@ class CategoryModelTest(TestCase):
         with self.assertRaises(Exception):
             category2 = Category(brand=self.brand, name="Electronics")
             category2.save()
+    
+    def test_is_ancestor_walks_hierarchy_in_one_query(self):
+        """Test that ancestor detection costs one query regardless of depth."""
+        root = Category.objects.create(brand=self.brand, name="Root")
+        node = root
+        for depth in range(4):
+            node = Category.objects.create(brand=self.brand, name=f"Level {depth}", parent=node)
+        other = Category.objects.create(brand=self.brand, name="Other")
+        
+        with self.assertNumQueries(1):
+            self.assertTrue(root.is_ancestor(node))
+        with self.assertNumQueries(1):
+            self.assertFalse(other.is_ancestor(node))
+        self.assertTrue(node.is_ancestor(node))
+        self.assertFalse(root.is_ancestor(None))
 
+    
+    def test_save_refuses_circular_parent(self):
+        """Test that an ORM save cannot move a category under its own descendant."""
+        root = Category.objects.create(brand=self.brand, name="Root")
+        child = Category.objects.create(brand=self.brand, name="Child", parent=root)
+        root = Category.objects.get(pk=root.pk)
+        root.parent = child
+        
+        with self.assertRaises(ValidationError):
+            root.save()
+        root.refresh_from_db()
+        self.assertIsNone(root.parent_id)
+    
+    def test_full_clean_skips_checks_for_unchanged_fields(self):
+        """Test that validation only re-checks the hierarchy and name when they change."""
+        root = Category.objects.create(brand=self.brand, name="Root")
+        child = Category.objects.create(brand=self.brand, name="Child", parent=root)
+        child = Category.objects.get(pk=child.pk)
+        
+        # Only the brand and parent foreign keys are looked up
+        with self.assertNumQueries(2):
+            child.full_clean()
+        
+        root = Category.objects.get(pk=root.pk)
+        root.parent = child
+        with self.assertRaises(ValidationError):
+            root.full_clean()
 
 class ProductModelTest(TestCase):
     """Test Product model functionality."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.brand = Brand.objects.create(name="Test Brand")
-        self.category = Category.objects.create(brand=self.brand, name="Electronics")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.brand = Brand.objects.create(name="Test Brand")
+        cls.category = Category.objects.create(brand=cls.brand, name="Electronics")
     
     def test_product_creation(self):
         """Test creating a product."""
@@ -123,69 +172,37 @@ class ProductModelTest(TestCase):
         other_brand = Brand.objects.create(name="Other Brand")
         other_category = Category.objects.create(brand=other_brand, name="Other Category")
         
-        with self.assertRaises(Exception):
-            product = Product(
-                brand=self.brand,
-                sku="PROD001",
-                name="Test Product",
-                category=other_category
-            )
+        product = Product(
+            brand=self.brand,
+            sku="PROD001",
+            name="Test Product",
+            category=other_category
+        )
+        with self.assertRaises(ValidationError):
+            product.full_clean()
+        
+        # Direct ORM saves are refused too
+        with self.assertRaises(ValidationError):
             product.save()
+        self.assertFalse(Product.objects.filter(sku="PROD001").exists())
 
 
-class CategoryAPITest(APITestCase):
+class CategoryAPITest(BrandRoleTestData, APITestCase):
     """Test Category API endpoints."""
     
-    def setUp(self):
-        """Set up test data."""
-        # Create brands
-        self.brand1 = Brand.objects.create(name="Brand One")
-        self.brand2 = Brand.objects.create(name="Brand Two")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        super().setUpTestData()
         
         # Create categories
-        self.category1 = Category.objects.create(brand=self.brand1, name="Electronics")
-        self.subcategory1 = Category.objects.create(
-            brand=self.brand1,
+        cls.category1 = Category.objects.create(brand=cls.brand1, name="Electronics")
+        cls.subcategory1 = Category.objects.create(
+            brand=cls.brand1,
             name="Smartphones",
-            parent=self.category1
-        )
-        self.category2 = Category.objects.create(brand=self.brand2, name="Clothing")
-        
-        # Create users
-        self.system_admin = User.objects.create_user(
-            email="admin@test.com",
-            password="TestPassword123!",
-            role=SYSTEM_ADMIN,
-            first_name="System",
-            last_name="Admin"
-        )
-        
-        self.brand_manager = User.objects.create_user(
-            email="manager@test.com",
-            password="TestPassword123!",
-            role=BRAND_MANAGER,
-            brand=self.brand1,
-            first_name="Brand",
-            last_name="Manager"
-        )
-        
-        self.store_manager = User.objects.create_user(
-            email="store@test.com",
-            password="TestPassword123!",
-            role=STORE_MANAGER,
-            brand=self.brand1,
-            first_name="Store",
-            last_name="Manager"
-        )
-        
-        self.staff = User.objects.create_user(
-            email="staff@test.com",
-            password="TestPassword123!",
-            role=STAFF,
-            brand=self.brand1,
-            first_name="Staff",
-            last_name="User"
+            parent=cls.category1
         )
+        cls.category2 = Category.objects.create(brand=cls.brand2, name="Clothing")
     
     def get_jwt_token(self, user):
         """Get JWT token for user."""
@@ -210,6 +227,17 @@ class CategoryAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2)  # Electronics + Smartphones
     
+    def test_category_list_counts_children_in_one_query(self):
+        """Test that children_count comes from the list query, not a COUNT per row."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        # User lookup, page count and one annotated category query
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/categories/')
+        counts = {c['name']: c['children_count'] for c in response.data['results']}
+        self.assertEqual(counts, {'Electronics': 1, 'Smartphones': 0})
+    
     def test_category_create_brand_manager_success(self):
         """Test that BRAND_MANAGER can create categories in their brand."""
         token = self.get_jwt_token(self.brand_manager)
@@ -223,6 +251,30 @@ class CategoryAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['name'], 'New Category')
     
+    def test_category_create_duplicate_name_case_insensitive(self):
+        """Test that a category name differing only in case is rejected within a brand."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        data = {'brand': str(self.brand1.id), 'name': 'ELECTRONICS'}
+        response = self.client.post('/api/categories/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', response.data)
+    
+    def test_category_bulk_create(self):
+        """Test that a list payload creates every category in one request."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        data = [
+            {'brand': str(self.brand1.id), 'name': 'Audio', 'parent': str(self.category1.id)},
+            {'brand': str(self.brand1.id), 'name': 'Video'},
+        ]
+        response = self.client.post('/api/categories/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([c['children_count'] for c in response.data], [0, 0])
+        self.assertEqual(response.data[0]['parent_name'], 'Electronics')
+    
     def test_category_create_with_parent(self):
         """Test creating category with parent relationship."""
         token = self.get_jwt_token(self.brand_manager)
@@ -238,6 +290,27 @@ class CategoryAPITest(APITestCase):
         self.assertEqual(response.data['name'], 'Tablets')
         self.assertEqual(str(response.data['parent']), str(self.category1.id))
     
+    def test_category_parent_brand_check_skips_parent_brand_lookup(self):
+        """Test that the parent brand check compares ids without loading the parent's brand."""
+        serializer = CategorySerializer(data={
+            'brand': str(self.brand2.id), 'name': 'Tablets', 'parent': str(self.category1.id)
+        })
+        
+        # One lookup each for the brand and parent primary keys
+        with self.assertNumQueries(2):
+            self.assertFalse(serializer.is_valid())
+        self.assertIn('parent', serializer.errors)
+    
+    def test_category_children_count_uses_prefetched_children(self):
+        """Test that a standalone serializer counts prefetched children without a COUNT query."""
+        category = Category.objects.select_related('brand').prefetch_related('children').get(
+            pk=self.category1.pk
+        )
+        
+        with self.assertNumQueries(0):
+            data = CategorySerializer(category).data
+        self.assertEqual(data['children_count'], 1)
+    
     def test_category_create_store_manager_forbidden(self):
         """Test that STORE_MANAGER cannot create categories."""
         token = self.get_jwt_token(self.store_manager)
@@ -262,6 +335,27 @@ class CategoryAPITest(APITestCase):
         response = self.client.post('/api/categories/', data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
+    def test_category_update_circular_parent_rejected(self):
+        """Test that a category cannot be moved under its own descendant."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        data = {'parent': str(self.subcategory1.id)}
+        response = self.client.patch(f'/api/categories/{self.category1.id}/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('parent', response.data)
+    
+    def test_category_update_loads_row_without_children_count(self):
+        """Test that a write looks the category up without the children GROUP BY."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/categories/{self.subcategory1.id}/', {'name': 'Phones'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['children_count'], 0)
+        self.assertFalse(any('GROUP BY' in q['sql'] for q in queries.captured_queries))
+    
     def test_category_hierarchy_retrieval(self):
         """Test retrieving category with parent-child relationships."""
         token = self.get_jwt_token(self.brand_manager)
@@ -271,69 +365,46 @@ class CategoryAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['children']), 1)
         self.assertEqual(response.data['children'][0]['name'], 'Smartphones')
+    
+    def test_category_retrieve_prefetches_children(self):
+        """Test that the nested children render without per-child queries."""
+        Category.objects.create(brand=self.brand1, name="Laptops", parent=self.category1)
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        # User lookup, the category and one prefetch for its children
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/categories/{self.category1.id}/')
+        self.assertEqual(response.data['children_count'], 2)
+        self.assertEqual(
+            {c['parent_name'] for c in response.data['children']}, {'Electronics'}
+        )
 
 
-class ProductAPITest(APITestCase):
+class ProductAPITest(BrandRoleTestData, APITestCase):
     """Test Product API endpoints."""
     
-    def setUp(self):
-        """Set up test data."""
-        # Create brands
-        self.brand1 = Brand.objects.create(name="Brand One")
-        self.brand2 = Brand.objects.create(name="Brand Two")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        super().setUpTestData()
         
         # Create categories
-        self.category1 = Category.objects.create(brand=self.brand1, name="Electronics")
-        self.category2 = Category.objects.create(brand=self.brand2, name="Clothing")
+        cls.category1 = Category.objects.create(brand=cls.brand1, name="Electronics")
+        cls.category2 = Category.objects.create(brand=cls.brand2, name="Clothing")
         
         # Create products
-        self.product1 = Product.objects.create(
-            brand=self.brand1,
+        cls.product1 = Product.objects.create(
+            brand=cls.brand1,
             sku="PROD001",
             name="Smartphone",
-            category=self.category1
+            category=cls.category1
         )
-        self.product2 = Product.objects.create(
-            brand=self.brand2,
+        cls.product2 = Product.objects.create(
+            brand=cls.brand2,
             sku="PROD002",
             name="T-Shirt",
-            category=self.category2
-        )
-        
-        # Create users
-        self.system_admin = User.objects.create_user(
-            email="admin@test.com",
-            password="TestPassword123!",
-            role=SYSTEM_ADMIN,
-            first_name="System",
-            last_name="Admin"
-        )
-        
-        self.brand_manager = User.objects.create_user(
-            email="manager@test.com",
-            password="TestPassword123!",
-            role=BRAND_MANAGER,
-            brand=self.brand1,
-            first_name="Brand",
-            last_name="Manager"
-        )
-        
-        self.store_manager = User.objects.create_user(
-            email="store@test.com",
-            password="TestPassword123!",
-            role=STORE_MANAGER,
-            brand=self.brand1,
-            first_name="Store",
-            last_name="Manager"
-        )
-        
-        self.staff = User.objects.create_user(
-            email="staff@test.com",
-            password="TestPassword123!",
-            role=STAFF,
-            brand=self.brand1,
-            first_name="Staff",
-            last_name="User"
+            category=cls.category2
         )
     
     def get_jwt_token(self, user):
@@ -350,6 +421,15 @@ class ProductAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2)
     
+    def test_product_list_count_falls_back_to_exact_count(self):
+        """Test that the paginated count stays exact when no planner estimate applies."""
+        token = self.get_jwt_token(self.system_admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        response = self.client.get('/api/products/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+    
     def test_product_list_brand_scoping(self):
         """Test that non-admin users only see products from their brand."""
         token = self.get_jwt_token(self.brand_manager)
@@ -360,6 +440,68 @@ class ProductAPITest(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Smartphone')
     
+    def test_product_list_joins_brand_and_category(self):
+        """Test that listing products does not query brand or category per row."""
+        Product.objects.create(brand=self.brand1, sku="PROD003", name="Tablet", category=self.category1)
+        token = self.get_jwt_token(self.system_admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        # User lookup, page count and one joined product query
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/products/')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][0]['category_name'], 'Electronics')
+    
+    def test_product_list_brand_manager_query_count(self):
+        """Test that a brand-scoped product list costs a fixed number of queries."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        # User lookup, page count and one brand-filtered product query
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/products/')
+        self.assertEqual([p['sku'] for p in response.data['results']], ['PROD001'])
+    
+    def test_product_list_serializer_matches_product_serializer(self):
+        """Test that the compact list rows carry the same values as ProductSerializer."""
+        product = Product.objects.select_related('brand', 'category').get(pk=self.product1.pk)
+        self.assertEqual(ProductListSerializer(product).data, ProductSerializer(product).data)
+        
+        product.category = None
+        self.assertIsNone(ProductListSerializer(product).data['category_name'])
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_product_list_unchanged_poll_returns_not_modified(self):
+        """Test that a list poll with a current ETag gets 304 without the page queries."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        etag = self.client.get('/api/products/')['ETag']
+        
+        # The validator comes from cached versions; only the user lookup runs
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        Product.objects.create(brand=self.brand1, sku="PROD009", name="Tablet")
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_product_list_poll_sees_renamed_category(self):
+        """Test that renaming a listed product's category invalidates the list ETag."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        etag = self.client.get('/api/products/')['ETag']
+        self.category1.name = 'Gadgets'
+        self.category1.save()
+        
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['category_name'], 'Gadgets')
+    
     def test_product_create_brand_manager_success(self):
         """Test that BRAND_MANAGER can create products in their brand."""
         token = self.get_jwt_token(self.brand_manager)
@@ -376,6 +518,91 @@ class ProductAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['name'], 'New Product')
     
+    def test_product_create_duplicate_sku_case_insensitive(self):
+        """Test that a SKU differing only in case is rejected within a brand."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        data = {
+            'brand': str(self.brand1.id),
+            'sku': 'prod001',
+            'name': 'Duplicate Product',
+            'is_active': True
+        }
+        response = self.client.post('/api/products/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('sku', response.data)
+    
+    def test_product_save_reraises_foreign_key_violation(self):
+        """Test that a foreign key violation is not reported as a duplicate SKU."""
+        with self.assertRaises(IntegrityError):
+            with ProductSerializer().unique_conflicts():
+                raise IntegrityError('FOREIGN KEY constraint failed')
+    
+    def test_product_bulk_create_checks_conflicts_in_one_query(self):
+        """Test that a list payload is checked and inserted in bulk."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        data = [
+            {'brand': str(self.brand1.id), 'sku': f'BULK{i}', 'name': f'Bulk {i}',
+             'category': str(self.category1.id)}
+            for i in range(5)
+        ]
+        response = self.client.post('/api/products/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(Product.objects.filter(sku__startswith='BULK').count(), 5)
+        
+        # Clashes with stored rows and within the payload are reported per item
+        data = [
+            {'brand': str(self.brand1.id), 'sku': 'prod001', 'name': 'Existing'},
+            {'brand': str(self.brand1.id), 'sku': 'NEW1', 'name': 'New'},
+            {'brand': str(self.brand1.id), 'sku': 'new1', 'name': 'Repeated'},
+        ]
+        response = self.client.post('/api/products/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('sku', response.data[0])
+        self.assertEqual(response.data[1], {})
+        self.assertIn('sku', response.data[2])
+        self.assertFalse(Product.objects.filter(sku='NEW1').exists())
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_product_bulk_create_invalidates_list_etag(self):
+        """Test that a bulk insert, which sends no post_save, still changes the list ETag."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        etag = self.client.get('/api/products/')['ETag']
+        self.client.post('/api/products/', [
+            {'brand': str(self.brand1.id), 'sku': 'BULK1', 'name': 'Bulk 1'},
+        ], format='json')
+        
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+    
+    def test_product_bulk_create_conflicts_fail_validation(self):
+        """Test that bulk SKU clashes are reported by is_valid(), before anything is saved."""
+        serializer = ProductSerializer(many=True, data=[
+            {'brand': str(self.brand1.id), 'sku': 'Prod001', 'name': 'Existing'},
+        ])
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('sku', serializer.errors[0])
+    
+    def test_product_bulk_create_other_brand_forbidden(self):
+        """Test that BRAND_MANAGER cannot bulk create products for another brand."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        data = [
+            {'brand': str(self.brand1.id), 'sku': 'PROD003', 'name': 'Own'},
+            {'brand': str(self.brand2.id), 'sku': 'PROD004', 'name': 'Other'},
+        ]
+        response = self.client.post('/api/products/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Product.objects.filter(sku__in=['PROD003', 'PROD004']).exists())
+    
     def test_product_create_store_manager_forbidden(self):
         """Test that STORE_MANAGER cannot create products."""
         token = self.get_jwt_token(self.store_manager)
@@ -390,6 +617,17 @@ class ProductAPITest(APITestCase):
         response = self.client.post('/api/products/', data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
+    def test_product_update_store_manager_forbidden(self):
+        """Test that STORE_MANAGER cannot update products and gets the standard forbidden body."""
+        token = self.get_jwt_token(self.store_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        response = self.client.patch(f'/api/products/{self.product1.id}/', {'name': 'Renamed'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json(), {"detail": "forbidden", "code": "PERMISSION_DENIED"})
+        self.product1.refresh_from_db(fields=['name'])
+        self.assertEqual(self.product1.name, 'Smartphone')
+    
     def test_product_create_staff_forbidden(self):
         """Test that STAFF cannot create products."""
         token = self.get_jwt_token(self.staff)
@@ -431,6 +669,18 @@ class ProductAPITest(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Inactive Product')
     
+    def test_product_export_streams_brand_products(self):
+        """Test that the export streams one JSON line per product in the user's brand."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        response = self.client.get('/api/products/export/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['sku'] for row in rows], ['PROD001'])
+        self.assertEqual(rows[0]['category_name'], 'Electronics')
+    
     def test_product_isolation(self):
         """Test that users cannot access products from other brands."""
         brand2_manager = User.objects.create_user(
@@ -1,22 +1,52 @@
 """Product and Category views for the inventory platform."""
-from rest_framework import viewsets, status
-from rest_framework.response import Response
-from django.db.models import Q
-from apps.common.permissions import BrandScopedPermission
-from apps.accounts.roles import SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER, STAFF
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
+from apps.common.pagination import CachedCountPagination
+from apps.common.permissions import (
+    BrandScopedPermission, RoleGatedViewSetMixin, request_brand_id, request_is_system_admin
+)
+from apps.common.renderers import ORJSONRenderer
+from apps.common.viewsets import ListETagMixin, parse_is_active
+from apps.accounts.roles import WRITE_ROLES
+from apps.brands.models import Brand
 from .models import Category, Product
 from .serializers import (
     CategorySerializer, CategoryDetailSerializer,
-    ProductSerializer, ProductDetailSerializer
+    ProductSerializer, ProductDetailSerializer, ProductListSerializer
+)
+
+# Only BRAND_MANAGER and SYSTEM_ADMIN may write categories and products
+ACTION_ROLES = {
+    'create': WRITE_ROLES,
+    'update': WRITE_ROLES,
+    'partial_update': WRITE_ROLES,
+    'destroy': WRITE_ROLES,
+}
+
+# Rows fetched per database round trip while streaming an export
+EXPORT_CHUNK_SIZE = 1000
+
+# Columns read by CategorySerializer and ProductListSerializer on list
+CATEGORY_LIST_FIELDS = (
+    'id', 'brand', 'brand__name', 'name', 'parent', 'parent__name', 'created_at', 'updated_at',
+)
+PRODUCT_LIST_FIELDS = (
+    'id', 'brand', 'brand__name', 'sku', 'name', 'category', 'category__name',
+    'is_active', 'created_at', 'updated_at',
 )
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ListETagMixin, RoleGatedViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Category model with role-based permissions."""
     
-    queryset = Category.objects.all()
+    queryset = Category.objects.select_related('brand', 'parent').order_by('-created_at')
     serializer_class = CategorySerializer
     permission_classes = [BrandScopedPermission]
+    pagination_class = CachedCountPagination
+    action_roles = ACTION_ROLES
+    etag_models = (Brand,)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -24,158 +54,107 @@ class CategoryViewSet(viewsets.ModelViewSet):
             return CategoryDetailSerializer
         return CategorySerializer
     
+    def get_serializer(self, *args, **kwargs):
+        """Accept a JSON array on create and insert it in bulk."""
+        if self.action == 'create' and isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+    
     def get_queryset(self):
         """Filter queryset based on user permissions and brand scoping."""
-        user = self.request.user
-        queryset = super().get_queryset()
-        
-        # System admins see all categories
-        if user.is_system_admin():
-            return queryset
-        
-        # Non-admin users only see categories from their brand
-        user_brand = user.get_brand()
-        if user_brand:
-            return queryset.filter(brand=user_brand)
+        is_admin = request_is_system_admin(self.request)
+        brand_id = request_brand_id(self.request)
         
         # Users without brand see nothing
-        return queryset.none()
-    
-    def create(self, request, *args, **kwargs):
-        """Handle category creation with proper permissions."""
-        user = request.user
+        if not is_admin and brand_id is None:
+            return self.queryset.none()
         
-        # Only BRAND_MANAGER and SYSTEM_ADMIN can create categories
-        if not user.has_role(SYSTEM_ADMIN, BRAND_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        queryset = super().get_queryset()
         
-        # For BRAND_MANAGER, ensure they're creating category in their brand
-        if not user.is_system_admin():
-            brand_id = request.data.get('brand')
-            user_brand = user.get_brand()
-            
-            if not user_brand or str(user_brand.id) != str(brand_id):
-                return Response(
-                    {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                    status=status.HTTP_403_FORBIDDEN
-                )
+        # Only reads render children_count; writes skip the GROUP BY join on get_object()
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.annotate(children_count=Count('children'))
         
-        return super().create(request, *args, **kwargs)
-    
-    def update(self, request, *args, **kwargs):
-        """Handle category updates with proper permissions."""
-        user = request.user
-        
-        # STAFF and STORE_MANAGER cannot update categories
-        if user.has_role(STAFF, STORE_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
+        # Load everything CategoryDetailSerializer nests in the same round trip
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('parent__brand', 'parent__parent').prefetch_related(
+                Prefetch('children', queryset=Category.objects.select_related('brand', 'parent').annotate(
+                    children_count=Count('children')
+                ).order_by('-created_at'))
             )
         
-        return super().update(request, *args, **kwargs)
-    
-    def destroy(self, request, *args, **kwargs):
-        """Handle category deletion with proper permissions."""
-        user = request.user
+        # The list serializer reads only the names of the joined rows
+        if self.action == 'list':
+            queryset = queryset.only(*CATEGORY_LIST_FIELDS)
         
-        # Only BRAND_MANAGER and SYSTEM_ADMIN can delete categories
-        if not user.has_role(SYSTEM_ADMIN, BRAND_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        # System admins see all categories
+        if is_admin:
+            return queryset
         
-        return super().destroy(request, *args, **kwargs)
+        # Non-admin users only see categories from their brand
+        return queryset.filter(brand_id=brand_id)
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ListETagMixin, RoleGatedViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Product model with role-based permissions."""
     
-    queryset = Product.objects.all()
+    queryset = Product.objects.select_related('brand', 'category')
     serializer_class = ProductSerializer
     permission_classes = [BrandScopedPermission]
+    pagination_class = CachedCountPagination
+    action_roles = ACTION_ROLES
+    etag_models = (Brand, Category)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'retrieve':
             return ProductDetailSerializer
+        if self.action in ('list', 'export'):
+            return ProductListSerializer
         return ProductSerializer
     
+    def get_serializer(self, *args, **kwargs):
+        """Accept a JSON array on create and insert it in bulk."""
+        if self.action == 'create' and isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+    
     def get_queryset(self):
         """Filter queryset based on user permissions and brand scoping."""
-        user = self.request.user
+        is_admin = request_is_system_admin(self.request)
+        brand_id = request_brand_id(self.request)
+        
+        # Users without brand see nothing
+        if not is_admin and brand_id is None:
+            return self.queryset.none()
+        
         queryset = super().get_queryset()
         
         # Apply is_active filter if requested
-        is_active = self.request.query_params.get('is_active')
+        is_active = parse_is_active(self.request)
         if is_active is not None:
-            if is_active.lower() == 'true':
-                queryset = queryset.filter(is_active=True)
-            elif is_active.lower() == 'false':
-                queryset = queryset.filter(is_active=False)
+            queryset = queryset.filter(is_active=is_active)
+        
+        # The list serializer reads only the names of the joined rows
+        if self.action in ('list', 'export'):
+            queryset = queryset.only(*PRODUCT_LIST_FIELDS)
         
         # System admins see all products
-        if user.is_system_admin():
+        if is_admin:
             return queryset
         
         # Non-admin users only see products from their brand
-        user_brand = user.get_brand()
-        if user_brand:
-            return queryset.filter(brand=user_brand)
-        
-        # Users without brand see nothing
-        return queryset.none()
+        return queryset.filter(brand_id=brand_id)
     
-    def create(self, request, *args, **kwargs):
-        """Handle product creation with proper permissions."""
-        user = request.user
-        
-        # Only BRAND_MANAGER and SYSTEM_ADMIN can create products
-        if not user.has_role(SYSTEM_ADMIN, BRAND_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # For BRAND_MANAGER, ensure they're creating product in their brand
-        if not user.is_system_admin():
-            brand_id = request.data.get('brand')
-            user_brand = user.get_brand()
-            
-            if not user_brand or str(user_brand.id) != str(brand_id):
-                return Response(
-                    {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        
-        return super().create(request, *args, **kwargs)
-    
-    def update(self, request, *args, **kwargs):
-        """Handle product updates with proper permissions."""
-        user = request.user
-        
-        # STAFF and STORE_MANAGER cannot update products
-        if user.has_role(STAFF, STORE_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        return super().update(request, *args, **kwargs)
-    
-    def destroy(self, request, *args, **kwargs):
-        """Handle product deletion with proper permissions."""
-        user = request.user
-        
-        # Only BRAND_MANAGER and SYSTEM_ADMIN can delete products
-        if not user.has_role(SYSTEM_ADMIN, BRAND_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        return super().destroy(request, *args, **kwargs)
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every visible product as JSON lines without materializing the queryset."""
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        renderer = ORJSONRenderer()
+        
+        def rows():
+            for product in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield renderer.render(serializer.to_representation(product)) + b'\n'
+        
+        return StreamingHttpResponse(rows(), content_type='application/x-ndjson')
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.8 on 2026-10-15 09:56
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0003_brand_active_created_idx"),
+        ("stores", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="store",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="store",
+            constraint=models.UniqueConstraint(
+                models.F("brand"),
+                django.db.models.functions.text.Lower("name"),
+                name="store_brand_name_ci_unique",
+                violation_error_message="Store name must be unique within the brand (case-insensitive).",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="store",
+            constraint=models.UniqueConstraint(
+                models.F("brand"),
+                django.db.models.functions.text.Lower("code"),
+                name="store_brand_code_ci_unique",
+                violation_error_message="Store code must be unique within the brand (case-insensitive).",
+            ),
+        ),
+    ]
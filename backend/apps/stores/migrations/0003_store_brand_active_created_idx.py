@@ -0,0 +1,30 @@
+# Generated by Django 5.0.8 on 2026-10-15 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0003_brand_active_created_idx"),
+        ("stores", "0002_store_ci_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="store",
+            name="code",
+            field=models.CharField(max_length=50),
+        ),
+        migrations.AlterField(
+            model_name="store",
+            name="name",
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="store",
+            index=models.Index(
+                fields=["brand", "is_active", "-created_at"], name="store_brand_active_created_idx"
+            ),
+        ),
+    ]
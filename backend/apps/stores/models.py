@@ -1,6 +1,7 @@
 """Store models for the inventory platform."""
 from django.db import models
-from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.db.models.functions import Lower
 from apps.common.models import BaseModel
 from apps.brands.models import Brand
 
@@ -9,8 +10,8 @@ class Store(BaseModel):
     """Store model representing a physical store location."""
     
     brand = models.ForeignKey(Brand, on_delete=models.CASCADE, related_name='stores')
-    name = models.CharField(max_length=255, db_index=True)
-    code = models.CharField(max_length=50, db_index=True)
+    name = models.CharField(max_length=255)
+    code = models.CharField(max_length=50)
     is_active = models.BooleanField(default=True)
     
     class Meta:
@@ -18,37 +19,24 @@ class Store(BaseModel):
         verbose_name = 'Store'
         verbose_name_plural = 'Stores'
         ordering = ['-created_at']
-        unique_together = [
-            ('brand', 'name'),
-            ('brand', 'code')
+        indexes = [
+            # Brand-scoped list, optionally filtered by is_active, in default ordering
+            models.Index(fields=['brand', 'is_active', '-created_at'], name='store_brand_active_created_idx'),
+        ]
+        constraints = [
+            # Case-insensitive name and code uniqueness per brand, enforced by unique expression indexes
+            models.UniqueConstraint(
+                F('brand'), Lower('name'),
+                name='store_brand_name_ci_unique',
+                violation_error_message='Store name must be unique within the brand (case-insensitive).',
+            ),
+            models.UniqueConstraint(
+                F('brand'), Lower('code'),
+                name='store_brand_code_ci_unique',
+                violation_error_message='Store code must be unique within the brand (case-insensitive).',
+            ),
         ]
     
     def __str__(self):
         return f"{self.brand.name} - {self.name}"
-    
-    def clean(self):
-        """Custom validation for store fields."""
-        super().clean()
-        if self.brand_id:
-            # Check name uniqueness per brand (case-insensitive)
-            name_exists = Store.objects.filter(
-                brand=self.brand,
-                name__iexact=self.name
-            ).exclude(pk=self.pk).exists()
-            
-            if name_exists:
-                raise ValidationError({'name': 'Store name must be unique within the brand (case-insensitive).'})
-            
-            # Check code uniqueness per brand (case-insensitive)
-            code_exists = Store.objects.filter(
-                brand=self.brand,
-                code__iexact=self.code
-            ).exclude(pk=self.pk).exists()
-            
-            if code_exists:
-                raise ValidationError({'code': 'Store code must be unique within the brand (case-insensitive).'})
-    
-    def save(self, *args, **kwargs):
-        """Override save to run validation."""
-        self.clean()
-        super().save(*args, **kwargs)
+
@@ -1,6 +1,9 @@
 """Tests for Store models and API endpoints."""
 import json
-from django.test import TestCase
+from unittest import mock
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
@@ -8,7 +11,10 @@ from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.accounts.roles import SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER, STAFF
 from apps.brands.models import Brand
+from apps.common.pagination import CachedCountPagination, CachedCountPaginator
+from apps.common.testing import BrandRoleTestData
 from .models import Store
+from .serializers import StoreSerializer
 
 User = get_user_model()
 
@@ -16,9 +22,10 @@ User = get_user_model()
 class StoreModelTest(TestCase):
     """Test Store model functionality."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.brand = Brand.objects.create(name="Test Brand")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.brand = Brand.objects.create(name="Test Brand")
     
     def test_store_creation(self):
         """Test creating a store."""
@@ -67,62 +74,19 @@ class StoreModelTest(TestCase):
             store2.save()
 
 
-class StoreAPITest(APITestCase):
+class StoreAPITest(BrandRoleTestData, APITestCase):
     """Test Store API endpoints."""
     
-    def setUp(self):
-        """Set up test data."""
-        # Create brands
-        self.brand1 = Brand.objects.create(name="Brand One")
-        self.brand2 = Brand.objects.create(name="Brand Two")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        super().setUpTestData()
         
         # Create stores
-        self.store1 = Store.objects.create(
-            brand=self.brand1,
-            name="Store One",
-            code="S001"
-        )
-        self.store2 = Store.objects.create(
-            brand=self.brand2,
-            name="Store Two",
-            code="S002"
-        )
-        
-        # Create users with different roles
-        self.system_admin = User.objects.create_user(
-            email="admin@test.com",
-            password="TestPassword123!",
-            role=SYSTEM_ADMIN,
-            first_name="System",
-            last_name="Admin"
-        )
-        
-        self.brand_manager = User.objects.create_user(
-            email="manager@test.com",
-            password="TestPassword123!",
-            role=BRAND_MANAGER,
-            brand=self.brand1,
-            first_name="Brand",
-            last_name="Manager"
-        )
-        
-        self.store_manager = User.objects.create_user(
-            email="store@test.com",
-            password="TestPassword123!",
-            role=STORE_MANAGER,
-            brand=self.brand1,
-            first_name="Store",
-            last_name="Manager"
-        )
-        
-        self.staff = User.objects.create_user(
-            email="staff@test.com",
-            password="TestPassword123!",
-            role=STAFF,
-            brand=self.brand1,
-            first_name="Staff",
-            last_name="User"
-        )
+        cls.store1, cls.store2 = Store.objects.bulk_create([
+            Store(brand=cls.brand1, name="Store One", code="S001"),
+            Store(brand=cls.brand2, name="Store Two", code="S002"),
+        ])
     
     def get_jwt_token(self, user):
         """Get JWT token for user."""
@@ -148,6 +112,30 @@ class StoreAPITest(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Store One')
     
+    def test_store_list_joins_brand(self):
+        """Test that listing stores does not query brands per row."""
+        Store.objects.bulk_create([
+            Store(brand=self.brand1, name=f"Branch {i}", code=f"B{i:03}") for i in range(5)
+        ])
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        # User lookup, page count and one joined store query
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/stores/')
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual({s['brand_name'] for s in response.data['results']}, {'Brand One'})
+    
+    def test_store_retrieve_joins_brand(self):
+        """Test that the nested brand on retrieve comes from the store query."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        # User lookup and one joined store query
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/stores/{self.store1.id}/')
+        self.assertEqual(response.data['brand']['name'], 'Brand One')
+    
     def test_store_create_brand_manager_success(self):
         """Test that BRAND_MANAGER can create stores in their brand."""
         token = self.get_jwt_token(self.brand_manager)
@@ -163,6 +151,40 @@ class StoreAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['name'], 'New Store')
     
+    def test_store_create_duplicate_name_or_code_case_insensitive(self):
+        """Test that a name or code differing only in case is rejected on the right field."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        for field, data in (
+            ('name', {'brand': str(self.brand1.id), 'name': 'STORE ONE', 'code': 'NS001'}),
+            ('code', {'brand': str(self.brand1.id), 'name': 'New Store', 'code': 's001'}),
+        ):
+            with self.subTest(field=field):
+                response = self.client.post('/api/stores/', data)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(list(response.data), [field])
+        self.assertEqual(Store.objects.filter(brand=self.brand1).count(), 1)
+    
+    def test_store_save_reraises_other_integrity_errors(self):
+        """Test that only the per-brand unique indexes are reported as field errors."""
+        with self.assertRaises(IntegrityError):
+            with StoreSerializer().unique_conflicts():
+                raise IntegrityError('FOREIGN KEY constraint failed')
+    
+    def test_store_create_brand_manager_accepts_any_uuid_spelling(self):
+        """Test that the brand check compares UUIDs rather than their string forms."""
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        data = {'brand': self.brand1.id.hex.upper(), 'name': 'New Store', 'code': 'NS001'}
+        response = self.client.post('/api/stores/', data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        data = {'brand': 'not-a-uuid', 'name': 'Other Store', 'code': 'NS002'}
+        response = self.client.post('/api/stores/', data)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
     def test_store_create_brand_manager_wrong_brand_forbidden(self):
         """Test that BRAND_MANAGER cannot create stores in other brands."""
         token = self.get_jwt_token(self.brand_manager)
@@ -279,3 +301,80 @@ class StoreAPITest(APITestCase):
         response = self.client.get('/api/stores/?is_active=false')
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Inactive Store')
+    
+    def test_store_is_active_filtering_accepts_numeric_flags(self):
+        """Test that ?is_active=1 and ?is_active=0 filter like true and false."""
+        Store.objects.create(brand=self.brand1, name="Inactive Store", code="IS001", is_active=False)
+        token = self.get_jwt_token(self.brand_manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        response = self.client.get('/api/stores/?is_active=1')
+        self.assertEqual([s['name'] for s in response.data['results']], ['Store One'])
+        response = self.client.get('/api/stores/?is_active=0')
+        self.assertEqual([s['name'] for s in response.data['results']], ['Inactive Store'])
+    
+    def test_store_list_without_brand_skips_store_queries(self):
+        """Test that a non-admin without a brand gets an empty list without querying stores."""
+        brandless_staff = User.objects.create_user(
+            email="nobrand@test.com",
+            password="TestPassword123!",
+            role=STAFF,
+            first_name="No",
+            last_name="Brand"
+        )
+        token = self.get_jwt_token(brandless_staff)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        # Only the authenticating user lookup runs
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/stores/?is_active=true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    @mock.patch.object(CachedCountPagination, 'page_size', 1)
+    def test_store_list_pages_use_cached_count_within_bounds(self):
+        """Test that middle pages skip the count while the last page recounts a stale total."""
+        self.addCleanup(cache.clear)
+        Store.objects.create(brand=self.brand1, name="Store Three", code="S003")
+        token = self.get_jwt_token(self.system_admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get('/api/stores/').data['count'], 3)
+        
+        # User lookup and the page query; the total comes from the cache
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/stores/?page=2')
+        self.assertEqual(response.data['count'], 3)
+        
+        # A page past the cached end is recounted rather than rejected
+        Store.objects.create(brand=self.brand1, name="Store Four", code="S004")
+        response = self.client.get('/api/stores/?page=4')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+        
+        # A last page emptied by deletes recounts and reports the new bound
+        Store.objects.filter(code__in=['S003', 'S004']).delete()
+        response = self.client.get('/api/stores/?page=3')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get('/api/stores/?page=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['next'])
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_store_list_count_is_cached_between_first_page_visits(self):
+        """Test that later pages reuse the count cached when page one was served."""
+        self.addCleanup(cache.clear)
+        token = self.get_jwt_token(self.system_admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        response = self.client.get('/api/stores/')
+        self.assertEqual(response.data['count'], 2)
+        Store.objects.create(brand=self.brand1, name="Store Three", code="S003")
+        
+        # A later page reads the cached total without counting
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(Store.objects.all(), 20).count, 2)
+        
+        # Page one always recounts
+        response = self.client.get('/api/stores/?page=1')
+        self.assertEqual(response.data['count'], 3)
@@ -1,19 +1,38 @@
 """Store views for the inventory platform."""
-from rest_framework import viewsets, status
-from rest_framework.response import Response
-from django.db.models import Q
-from apps.common.permissions import BrandScopedPermission
-from apps.accounts.roles import SYSTEM_ADMIN, BRAND_MANAGER, STORE_MANAGER, STAFF
+from rest_framework import viewsets
+from apps.common.pagination import CachedCountPagination
+from apps.common.permissions import (
+    BrandScopedPermission, RoleGatedViewSetMixin, request_brand_id, request_is_system_admin
+)
+from apps.common.viewsets import ListETagMixin, parse_is_active
+from apps.accounts.roles import MANAGER_ROLES, WRITE_ROLES
+from apps.brands.models import Brand
 from .models import Store
 from .serializers import StoreSerializer, StoreDetailSerializer
 
+# Roles allowed to run each write action; STAFF is read-only
+ACTION_ROLES = {
+    'create': WRITE_ROLES,
+    'update': MANAGER_ROLES,
+    'partial_update': MANAGER_ROLES,
+    'destroy': WRITE_ROLES,
+}
 
-class StoreViewSet(viewsets.ModelViewSet):
+# Columns read by StoreSerializer on list
+STORE_LIST_FIELDS = (
+    'id', 'brand', 'brand__name', 'name', 'code', 'is_active', 'created_at', 'updated_at',
+)
+
+
+class StoreViewSet(ListETagMixin, RoleGatedViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Store model with role-based permissions."""
     
-    queryset = Store.objects.all()
+    queryset = Store.objects.select_related('brand')
     serializer_class = StoreSerializer
     permission_classes = [BrandScopedPermission]
+    pagination_class = CachedCountPagination
+    action_roles = ACTION_ROLES
+    etag_models = (Brand,)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -23,75 +42,27 @@ class StoreViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset based on user permissions and brand scoping."""
-        user = self.request.user
+        is_admin = request_is_system_admin(self.request)
+        brand_id = request_brand_id(self.request)
+        
+        # Users without brand see nothing
+        if not is_admin and brand_id is None:
+            return self.queryset.none()
+        
         queryset = super().get_queryset()
         
         # Apply is_active filter if requested
-        is_active = self.request.query_params.get('is_active')
+        is_active = parse_is_active(self.request)
         if is_active is not None:
-            if is_active.lower() == 'true':
-                queryset = queryset.filter(is_active=True)
-            elif is_active.lower() == 'false':
-                queryset = queryset.filter(is_active=False)
+            queryset = queryset.filter(is_active=is_active)
+        
+        # The list serializer reads only the brand's name
+        if self.action == 'list':
+            queryset = queryset.only(*STORE_LIST_FIELDS)
         
         # System admins see all stores
-        if user.is_system_admin():
+        if is_admin:
             return queryset
         
         # Non-admin users only see stores from their brand
-        user_brand = user.get_brand()
-        if user_brand:
-            return queryset.filter(brand=user_brand)
-        
-        # Users without brand see nothing
-        return queryset.none()
-    
-    def create(self, request, *args, **kwargs):
-        """Handle store creation with proper permissions."""
-        user = request.user
-        
-        # Only BRAND_MANAGER and SYSTEM_ADMIN can create stores
-        if not user.has_role(SYSTEM_ADMIN, BRAND_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # For BRAND_MANAGER, ensure they're creating store in their brand
-        if not user.is_system_admin():
-            brand_id = request.data.get('brand')
-            user_brand = user.get_brand()
-            
-            if not user_brand or str(user_brand.id) != str(brand_id):
-                return Response(
-                    {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        
-        return super().create(request, *args, **kwargs)
-    
-    def update(self, request, *args, **kwargs):
-        """Handle store updates with proper permissions."""
-        user = request.user
-        
-        # STAFF cannot update stores
-        if user.has_role(STAFF):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        return super().update(request, *args, **kwargs)
-    
-    def destroy(self, request, *args, **kwargs):
-        """Handle store deletion with proper permissions."""
-        user = request.user
-        
-        # Only BRAND_MANAGER and SYSTEM_ADMIN can delete stores
-        if not user.has_role(SYSTEM_ADMIN, BRAND_MANAGER):
-            return Response(
-                {"detail": "forbidden", "code": "PERMISSION_DENIED"},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        return super().destroy(request, *args, **kwargs)
+        return queryset.filter(brand_id=brand_id)
@@ -1,10 +1,10 @@
 import json
 
-from django.test import TestCase
+from django.test import SimpleTestCase
 from django.urls import reverse
 
 
-class HealthEndpointTestCase(TestCase):
+class HealthEndpointTestCase(SimpleTestCase):
     """Test the health endpoint."""
 
     def test_health_endpoint_returns_ok_status(self):
@@ -0,0 +1,17 @@
+import json
+import uuid
+
+from django.test import SimpleTestCase
+
+from apps.common.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    """Test the orjson-backed renderer."""
+
+    def test_render_stringifies_non_str_keys(self):
+        """Test that UUID and int dict keys render as strings instead of raising."""
+        key = uuid.uuid4()
+        rendered = ORJSONRenderer().render({key: 1, 2: "two"})
+
+        self.assertEqual(json.loads(rendered), {str(key): 1, "2": "two"})